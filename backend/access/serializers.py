@@ -1,5 +1,29 @@
+from models.models import Review, User
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from utils.json_provider import dumps_value
+
 from .access import visible_fields
 
+Recipient = aliased(User, name="recipient")
+Author = aliased(User, name="author")
+
+# field name -> column it is read from, in output order
+REVIEW_COLUMNS = {
+    "id": Review.id,
+    "created_at": Review.created_at,
+    "recipient_id": Review.recipient_id,
+    "recipient_name": Recipient.name,
+    "author_id": Review.author_id,
+    "author_name": Author.name,
+    "positive": Review.positive,
+    "negative": Review.negative,
+}
+
+# keyset pagination always needs these, whatever the role
+KEYSET_FIELDS = {"id", "created_at"}
+
 
 def serialize_review_for_role(review, role):
     row = {
@@ -14,3 +38,43 @@ def serialize_review_for_role(review, role):
     }
     allowed = visible_fields(role)
     return {k: v for k, v in row.items() if k in allowed}
+
+
+def select_reviews_for_role(role):
+    """
+    Builds a SELECT over reviews that loads only the columns the role may see.
+    The users table is joined only for the names that are actually visible.
+    """
+    fields = visible_fields(role) | KEYSET_FIELDS
+    columns = [
+        column.label(name) for name, column in REVIEW_COLUMNS.items() if name in fields
+    ]
+
+    query = select(*columns).select_from(Review)
+    if "recipient_name" in fields:
+        query = query.join(Recipient, Recipient.id == Review.recipient_id)
+    if "author_name" in fields:
+        query = query.join(Author, Author.id == Review.author_id)
+    return query
+
+
+def encode_review_rows(rows, role):
+    """
+    Yields rows returned by select_reviews_for_role as JSON objects (bytes),
+    with the same keys and format as jsonify of the visible fields but
+    without building a dict per row.
+    """
+    allowed = visible_fields(role)
+    template = None
+
+    for row in rows:
+        if template is None:
+            # (position in row, encoded key), sorted by key like jsonify
+            template = [
+                (index, f'"{name}":'.encode())
+                for index, name in sorted(
+                    enumerate(row._fields), key=lambda field: field[1]
+                )
+                if name in allowed
+            ]
+        yield b"{" + b",".join(key + dumps_value(row[index]) for index, key in template) + b"}"
@@ -1,35 +1,107 @@
-from flask import Flask, jsonify
+import os
+
+from flask import Flask, current_app, jsonify
 from flask_cors import CORS
+from commands.seed import seed_cli
+from commands.stats import stats_cli
+from commands.tokens import tokens_cli
+from commands.users import users_cli
 from errors.api_errors import APIError
-from models.models import init_db
+from models.async_db import init_async_engine
+from models.models import init_engine
 from routes.auth import auth_bp
+from routes.metrics import metrics_bp
 from routes.reviews import reviews_bp
+from utils.hashing import password_hasher
+from utils.cache_backends import create_backend
+from utils.json_provider import init_json_provider
+from utils.metrics import init_request_metrics
+from utils.rate_limit import rate_limiter
+from utils.response_cache import review_feed_cache
+from utils.token_janitor import start_token_janitor
+from utils.user_cache import user_cache
 from werkzeug.exceptions import HTTPException
 from config import config_by_name
 
-app = Flask(__name__)
-CORS(app, origins=["http://localhost:5173"], supports_credentials=True)
 
-# use config
-app.config.from_object(config_by_name["development"])
+def create_app(config_name="default"):
+    """Creates the Flask app, its database engines and worker pools."""
+    app = Flask(__name__)
+    CORS(app, origins=["http://localhost:5173"], supports_credentials=True)
+
+    # use config
+    app.config.from_object(config_by_name[config_name])
+
+    # Encode responses with orjson when it is installed
+    init_json_provider(app)
+
+    # Create database engines; the schema is managed by alembic migrations
+    init_engine(app.config)
+    init_async_engine(app.config)
+
+    # Start the password hashing pool
+    password_hasher.configure(
+        method=app.config["PASSWORD_HASH_METHOD"],
+        executor=app.config["PASSWORD_HASH_EXECUTOR"],
+        workers=app.config["PASSWORD_HASH_WORKERS"],
+        max_queue=app.config["PASSWORD_HASH_MAX_QUEUE"],
+        timeout=app.config["PASSWORD_HASH_TIMEOUT_SECONDS"],
+    )
+
+    # Size the user-existence cache used by verify_token
+    user_cache.configure(
+        app.config["USER_CACHE_MAX_SIZE"], app.config["USER_CACHE_TTL_SECONDS"]
+    )
+
+    # Cache for serialized review feed pages
+    review_feed_cache.configure(
+        create_backend(app.config, "FEED_CACHE"), app.config["FEED_CACHE_TTL_SECONDS"]
+    )
+
+    # Request limits for the auth endpoints
+    rate_limiter.configure(
+        create_backend(app.config, "RATE_LIMIT"),
+        app.config["RATE_LIMIT_WINDOW_SECONDS"],
+        {
+            "login_ip": app.config["LOGIN_RATE_LIMIT_PER_IP"],
+            "login_email": app.config["LOGIN_RATE_LIMIT_PER_EMAIL"],
+            "register_ip": app.config["REGISTER_RATE_LIMIT_PER_IP"],
+        },
+    )
+
+    # Purge expired and revoked refresh tokens in the background, if enabled
+    if app.config["TOKEN_JANITOR_INTERVAL_SECONDS"] > 0:
+        start_token_janitor(app)
 
-# Initialize database
-init_db()
+    # Time requests and count their queries
+    init_request_metrics(app)
 
+    # Register blueprint
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(reviews_bp)
+    if app.config["METRICS_ENABLED"]:
+        app.register_blueprint(metrics_bp)
 
-# Register blueprint
-app.register_blueprint(auth_bp)
-app.register_blueprint(reviews_bp)
+    # Register CLI commands
+    app.cli.add_command(tokens_cli)
+    app.cli.add_command(seed_cli)
+    app.cli.add_command(users_cli)
+    app.cli.add_command(stats_cli)
+
+    # Register error handlers
+    app.register_error_handler(APIError, handle_api_error)
+    app.register_error_handler(HTTPException, handle_http_exception)
+    app.register_error_handler(Exception, handle_generic_exception)
+
+    return app
 
 
 # Custom error handling
-@app.errorhandler(APIError)
 def handle_api_error(error):
     return error.to_response()
 
 
 # Standard HTTP error handling
-@app.errorhandler(HTTPException)
 def handle_http_exception(error):
     response = jsonify({"error": {"code": error.code, "message": error.description}})
     response.status_code = error.code
@@ -37,9 +109,8 @@ def handle_http_exception(error):
 
 
 # Unhandled errors
-@app.errorhandler(Exception)
 def handle_generic_exception(error):
-    app.logger.error(f"Unhandled exception: {str(error)}")
+    current_app.logger.error(f"Unhandled exception: {str(error)}")
 
     response = jsonify(
         {
@@ -53,5 +124,8 @@ def handle_generic_exception(error):
     return response
 
 
+app = create_app(os.environ.get("FLASK_CONFIG", "development"))
+
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", debug=True)
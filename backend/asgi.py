@@ -0,0 +1,217 @@
+"""
+ASGI entry point. Serves the same Flask app (blueprints and error handlers
+included) under an ASGI server:
+
+    uvicorn asgi:asgi_app --host 0.0.0.0 --port 5000
+
+Async views are dispatched directly on the server's event loop and run their
+database work through the pooled AsyncSessionLocal, so requests waiting on
+Postgres hold neither a thread nor a connection of their own while they wait.
+Sync views (writes, auth, exports) run on a bounded thread pool.
+
+The async path re-creates Flask's full_dispatch_request around the awaited
+view, so Flask and Werkzeug are pinned in requirements.txt and
+tests/test_asgi.py must pass before bumping them. It also bypasses
+app.wsgi_app: if WSGI middleware is installed there (ProxyFix...), every
+request takes the WSGI path instead. Prefer ASGI-level equivalents, e.g.
+uvicorn --proxy-headers.
+"""
+
+import inspect
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+
+from asgiref.sync import async_to_sync, sync_to_async
+from flask import Flask, request_started
+from werkzeug.exceptions import HTTPException
+
+from app import app
+from models import async_db
+from models.async_db import init_async_engine
+
+# everything runs on the server's event loop here, so the async engine can pool
+init_async_engine(app.config, pooled=True)
+
+# request bodies larger than this are spooled to disk
+BODY_MEMORY_LIMIT = 65536
+
+logger = logging.getLogger(__name__)
+
+
+def build_environ(scope, body):
+    """Translates an ASGI http scope and request body into a WSGI environ."""
+    script_name = scope.get("root_path", "").encode("utf8").decode("latin1")
+    path_info = scope["path"].encode("utf8").decode("latin1")
+    if path_info.startswith(script_name):
+        path_info = path_info[len(script_name) :]
+
+    server = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": script_name,
+        "PATH_INFO": path_info,
+        "QUERY_STRING": scope["query_string"].decode("ascii"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope['http_version']}",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": body,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    if scope.get("client"):
+        environ["REMOTE_ADDR"] = scope["client"][0]
+
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin1").upper().replace("-", "_")
+        if name not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            name = f"HTTP_{name}"
+        value = value.decode("latin1")
+        environ[name] = f"{environ[name]},{value}" if name in environ else value
+    return environ
+
+
+def response_start(status, headers):
+    return {
+        "type": "http.response.start",
+        "status": int(status.split(" ", 1)[0]),
+        "headers": [
+            (name.lower().encode("latin1"), value.encode("latin1"))
+            for name, value in headers
+        ],
+    }
+
+
+class FlaskAsgi:
+    """
+    Serves a Flask app over ASGI. Requests routed to `async def` views go
+    through Flask's request lifecycle (before/after request hooks, error
+    handlers, teardown) on the event loop; everything else is handed to the
+    WSGI app on `executor`.
+    """
+
+    def __init__(self, flask_app, executor):
+        self.app = flask_app
+        self.executor = executor
+        # middleware wrapping wsgi_app would not see async requests
+        self.dispatch_async_views = (
+            getattr(flask_app.wsgi_app, "__func__", None) is Flask.wsgi_app
+        )
+        if not self.dispatch_async_views:
+            logger.warning(
+                "app.wsgi_app is wrapped by WSGI middleware; serving async views "
+                "through the thread pool so the middleware sees every request"
+            )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.lifespan(receive, send)
+        if scope["type"] != "http":
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+        with SpooledTemporaryFile(max_size=BODY_MEMORY_LIMIT) as body:
+            while True:
+                message = await receive()
+                body.write(message.get("body", b""))
+                if not message.get("more_body"):
+                    break
+            body.seek(0)
+
+            environ = build_environ(scope, body)
+            if self.is_async_view(environ):
+                await self.dispatch_async(environ, send)
+            else:
+                await sync_to_async(
+                    self.run_wsgi, thread_sensitive=False, executor=self.executor
+                )(environ, async_to_sync(send))
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await async_db.async_engine.dispose()
+                self.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def is_async_view(self, environ):
+        # CORS preflights and unmatched URLs take the regular WSGI path
+        if not self.dispatch_async_views or environ["REQUEST_METHOD"] == "OPTIONS":
+            return False
+        try:
+            endpoint, _ = self.app.url_map.bind_to_environ(environ).match()
+        except HTTPException:
+            return False
+        return inspect.iscoroutinefunction(self.app.view_functions.get(endpoint))
+
+    async def dispatch_async(self, environ, send):
+        """Flask's full_dispatch_request, with the view awaited on this loop."""
+        flask_app = self.app
+        error = None
+        ctx = flask_app.request_context(environ)
+        ctx.push()
+        try:
+            try:
+                try:
+                    request_started.send(flask_app, _async_wrapper=flask_app.ensure_sync)
+                    rv = flask_app.preprocess_request()
+                    if rv is None:
+                        if ctx.request.routing_exception is not None:
+                            raise ctx.request.routing_exception
+                        view = flask_app.view_functions[ctx.request.url_rule.endpoint]
+                        rv = await view(**ctx.request.view_args)
+                except Exception as e:
+                    rv = flask_app.handle_user_exception(e)
+                response = flask_app.finalize_request(rv)
+            except Exception as e:
+                error = e
+                response = flask_app.handle_exception(e)
+
+            app_iter, status, headers = response.get_wsgi_response(environ)
+            await send(response_start(status, headers))
+            for chunk in app_iter:
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body"})
+        finally:
+            if error is not None and flask_app.should_ignore_error(error):
+                error = None
+            ctx.pop(error)
+
+    def run_wsgi(self, environ, send):
+        """Runs the WSGI app on an executor thread, streaming its output."""
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started["message"] = response_start(status, headers)
+
+        app_iter = self.app(environ, start_response)
+        try:
+            for chunk in app_iter:
+                if not chunk:
+                    continue
+                if "sent" not in started:
+                    send(started["message"])
+                    started["sent"] = True
+                send({"type": "http.response.body", "body": chunk, "more_body": True})
+            if "sent" not in started:
+                send(started["message"])
+            send({"type": "http.response.body"})
+        finally:
+            if hasattr(app_iter, "close"):
+                app_iter.close()
+
+
+asgi_app = FlaskAsgi(
+    app,
+    ThreadPoolExecutor(
+        max_workers=app.config["ASGI_MAX_THREADS"], thread_name_prefix="asgi"
+    ),
+)
@@ -0,0 +1,75 @@
+import json
+import os
+import platform
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def baseline_path(name):
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def load_baseline(name):
+    """Returns the stored baseline results for `name`, or None if there is none."""
+    path = baseline_path(name)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def save_baseline(name, results):
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    with open(baseline_path(name), "w") as f:
+        json.dump(
+            {
+                "machine": f"{platform.machine()} / Python {platform.python_version()}",
+                "results": results,
+            },
+            f,
+            indent=2,
+            sort_keys=True,
+        )
+        f.write("\n")
+
+
+def compare(results, baseline, metrics, tolerance):
+    """
+    Compares results against a baseline, both {name: {metric: value}}.
+    `metrics` maps each metric to "lower" or "higher" (which direction is
+    better). Returns a description of every metric that got worse by more
+    than `tolerance` (a fraction).
+    """
+    regressions = []
+    for name, values in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric, better in metrics.items():
+            old, new = base.get(metric), values.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (better == "lower" and change > tolerance) or (
+                better == "higher" and -change > tolerance
+            ):
+                regressions.append(f"{name} {metric}: {old:.4g} -> {new:.4g} ({change:+.0%})")
+    return regressions
+
+
+def print_table(headers, rows):
+    widths = [
+        max(len(str(header)), *(len(str(row[i])) for row in rows)) if rows else len(header)
+        for i, header in enumerate(headers)
+    ]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(str(cell).ljust(w) for cell, w in zip(row, widths)))
@@ -0,0 +1,149 @@
+"""
+Micro-benchmarks for hot helpers that need no database: review
+serialization, JWT encode/decode and password hashing.
+
+Run from backend/:
+
+    python -m benchmarks.micro                  # print timings
+    python -m benchmarks.micro --compare        # exit 1 on regressions vs the baseline
+    python -m benchmarks.micro --save-baseline  # store these timings as the baseline
+
+Baselines are machine specific; refresh them when the benchmark host changes.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from benchmarks.common import compare, load_baseline, print_table, save_baseline
+
+
+def make_review():
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        created_at=datetime.now(timezone.utc),
+        recipient_id=uuid.uuid4(),
+        recipient=SimpleNamespace(name="Recipient Name"),
+        author_id=uuid.uuid4(),
+        author=SimpleNamespace(name="Author Name"),
+        positive="Great teammate " * 10,
+        negative="Could be faster " * 3,
+    )
+
+
+def build_benchmarks(app):
+    """Returns {name: (callable, calls per timing)}; call inside an app context."""
+    from access.access import Role
+    from access.serializers import REVIEW_COLUMNS, encode_review_rows, serialize_review_for_role
+    from utils.auth_utils import decode_token, generate_jwt
+    from utils.hashing import password_hasher
+
+    review = make_review()
+    page = [make_review() for _ in range(50)]
+
+    ReviewRow = namedtuple("ReviewRow", list(REVIEW_COLUMNS))
+    rows = [
+        ReviewRow(
+            r.id, r.created_at, r.recipient_id, r.recipient.name,
+            r.author_id, r.author.name, r.positive, r.negative,
+        )
+        for r in page
+    ]
+
+    token, _, _ = generate_jwt(str(uuid.uuid4()), "colleague", 900)
+    password_hash = password_hasher.hash("benchmark-password")
+
+    benchmarks = {}
+    # serialize_review_for_role is the old ORM-object path, kept to compare
+    # against; the API encodes rows with encode_review_rows
+    for role in Role:
+        benchmarks[f"serialize_review_for_role[{role.value}]"] = (
+            lambda role=role: serialize_review_for_role(review, role),
+            2000,
+        )
+    benchmarks["serialize_review_for_role[page of 50]"] = (
+        lambda: [serialize_review_for_role(r, Role.colleague) for r in page],
+        100,
+    )
+    benchmarks["encode_review_rows[page of 50]"] = (
+        lambda: b",".join(encode_review_rows(rows, Role.super_rat)),
+        100,
+    )
+    benchmarks["jwt_encode"] = (lambda: generate_jwt(str(uuid.uuid4()), "colleague", 900), 1000)
+    benchmarks["jwt_decode"] = (lambda: decode_token(token), 1000)
+    benchmarks[f"password_hash[{app.config['PASSWORD_HASH_METHOD']}]"] = (
+        lambda: password_hasher.hash("benchmark-password"),
+        1,
+    )
+    benchmarks[f"password_check[{app.config['PASSWORD_HASH_METHOD']}]"] = (
+        lambda: password_hasher.check(password_hash, "benchmark-password"),
+        1,
+    )
+    return benchmarks
+
+
+def measure(fn, number, repeat):
+    """Median and best time per call over `repeat` timings of `number` calls."""
+    fn()  # warm up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number)
+    return {"median_us": statistics.median(timings) * 1e6, "best_us": min(timings) * 1e6}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--config", default="production", help="Config name passed to create_app")
+    parser.add_argument("--repeat", type=int, default=7, help="Timings per benchmark")
+    parser.add_argument("--filter", default="", help="Only run benchmarks containing this text")
+    parser.add_argument("--baseline", default="micro", help="Baseline name in benchmarks/baselines/")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--compare", action="store_true", help="Exit 1 if a benchmark regressed vs the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown as a fraction")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    from app import create_app
+
+    app = create_app(args.config)
+    with app.app_context():
+        results = {
+            name: measure(fn, number, args.repeat)
+            for name, (fn, number) in build_benchmarks(app).items()
+            if args.filter in name
+        }
+
+    print_table(
+        ["benchmark", "median us", "best us"],
+        [[name, f"{r['median_us']:.2f}", f"{r['best_us']:.2f}"] for name, r in results.items()],
+    )
+
+    baseline = load_baseline(args.baseline)
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Saved baseline '{args.baseline}'")
+    if args.compare:
+        if baseline is None:
+            sys.exit(f"no baseline '{args.baseline}' to compare against")
+        regressions = compare(results, baseline, {"median_us": "lower"}, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
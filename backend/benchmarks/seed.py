@@ -0,0 +1,80 @@
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert
+
+from access.access import Role
+from models.models import Review, Session, User
+from utils.hashing import password_hasher
+from utils.review_stats import rebuild_review_stats
+
+BENCH_EMAIL_DOMAIN = "bench.example"
+BENCH_PASSWORD = "bench-password"
+
+# share of benchmark users per role
+ROLE_WEIGHTS = {Role.colleague: 0.8, Role.rat: 0.15, Role.super_rat: 0.05}
+
+
+def bench_email(index):
+    return f"bench-user-{index}@{BENCH_EMAIL_DOMAIN}"
+
+
+def seed(users, reviews, batch_size=5000, seed_value=0):
+    """
+    Replaces the benchmark users (and, through the FK cascade, their reviews)
+    with `users` new ones and `reviews` reviews between them. Data outside
+    the benchmark email domain is left alone. Returns the users as
+    (id, email, role) tuples.
+    """
+    if reviews and users < 2:
+        raise ValueError("reviews need at least two users")
+
+    rng = random.Random(seed_value)
+    # every benchmark user shares one password, so it is hashed once
+    password_hash = password_hasher.hash(BENCH_PASSWORD)
+    now = datetime.now(timezone.utc)
+
+    roles = list(ROLE_WEIGHTS)
+    seeded = [
+        (uuid.uuid4(), bench_email(i), rng.choices(roles, list(ROLE_WEIGHTS.values()))[0].value)
+        for i in range(users)
+    ]
+
+    with Session.begin() as session:
+        session.execute(delete(User).where(User.email.like(f"%@{BENCH_EMAIL_DOMAIN}")))
+
+        for start in range(0, users, batch_size):
+            session.execute(
+                insert(User),
+                [
+                    {
+                        "id": user_id,
+                        "email": email,
+                        "name": f"Bench User {email.split('@')[0].rsplit('-', 1)[1]}",
+                        "role": role,
+                        "password_hash": password_hash,
+                    }
+                    for user_id, email, role in seeded[start : start + batch_size]
+                ],
+            )
+
+        for start in range(0, reviews, batch_size):
+            rows = []
+            for _ in range(min(batch_size, reviews - start)):
+                author, recipient = rng.sample(seeded, 2)
+                rows.append(
+                    {
+                        "id": uuid.uuid4(),
+                        "positive": "Great teammate " * rng.randint(1, 10),
+                        "negative": "Could be faster " * rng.randint(0, 5),
+                        "recipient_id": recipient[0],
+                        "author_id": author[0],
+                        "created_at": now - timedelta(seconds=rng.randint(0, 365 * 86400)),
+                    }
+                )
+            session.execute(insert(Review), rows)
+
+    # bulk inserts bypass the per-write stats maintenance
+    rebuild_review_stats()
+    return seeded
@@ -0,0 +1,13 @@
+import click
+from flask.cli import AppGroup
+
+from utils.review_stats import rebuild_review_stats
+
+stats_cli = AppGroup("stats", help="Review statistics maintenance.")
+
+
+@stats_cli.command("rebuild")
+def rebuild():
+    """Recomputes the review_stats aggregate from the reviews table."""
+    report = rebuild_review_stats()
+    click.echo(f"Rebuilt review stats for {report['users']} users ({report['seconds']}s)")
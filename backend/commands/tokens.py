@@ -0,0 +1,21 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from utils.token_janitor import purge_refresh_tokens
+
+tokens_cli = AppGroup("tokens", help="Refresh token maintenance.")
+
+
+@tokens_cli.command("purge")
+@click.option("--batch-size", type=int, default=None, help="Rows deleted per transaction.")
+@click.option("--max-batches", type=int, default=None, help="Stop after this many batches.")
+def purge(batch_size, max_batches):
+    """Deletes expired and revoked refresh tokens in batches."""
+    report = purge_refresh_tokens(
+        batch_size or current_app.config["TOKEN_PURGE_BATCH_SIZE"], max_batches
+    )
+    click.echo(
+        f"Removed {report['deleted']} refresh tokens "
+        f"in {report['batches']} batches ({report['seconds']}s)"
+    )
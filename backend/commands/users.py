@@ -0,0 +1,43 @@
+import csv
+
+import click
+from flask.cli import AppGroup
+
+from utils.directory_sync import read_employees, sync_employees
+
+users_cli = AppGroup("users", help="User directory maintenance.")
+
+
+@users_cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "file_format", type=click.Choice(["csv", "ndjson"]), default=None, help="Input format (default: from the file extension).")
+@click.option("--update-roles/--keep-roles", default=None, help="Whether existing users take the role from the file (default: if the file has roles); rows without a role keep the current one.")
+@click.option("--workers", type=int, default=None, help="Password hashing processes (default: CPU count).")
+@click.option("--credentials-out", type=click.Path(dir_okay=False, writable=True), default=None, help="CSV to write generated initial passwords to.")
+def import_users(path, file_format, update_roles, workers, credentials_out):
+    """
+    Syncs users from an employee list (CSV or NDJSON with email, name and
+    optional role and password fields), inserting new users and updating
+    existing ones by email.
+    """
+    report = sync_employees(read_employees(path, file_format), update_roles, workers)
+
+    generated = report["generated_passwords"]
+    if generated and credentials_out:
+        with open(credentials_out, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["email", "password"])
+            writer.writerows(generated.items())
+
+    click.echo(
+        f"Inserted {report['inserted']}, updated {report['updated']}, "
+        f"unchanged {report['unchanged']}, skipped {report['skipped']} "
+        f"({report['seconds']}s)"
+    )
+    for reason, count in sorted(report["skipped_reasons"].items()):
+        click.echo(f"  skipped, {reason}: {count}")
+    if generated:
+        click.echo(
+            f"Generated initial passwords for {len(generated)} users"
+            + (f", written to {credentials_out}" if credentials_out else "; pass --credentials-out to keep them")
+        )
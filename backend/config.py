@@ -4,15 +4,34 @@ import os
 class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY", "default-key-for-dev-only")
 
-    # Database
-    POSTGRES_DB = os.environ.get("POSTGRES_DB", "knowyourhero_dev")
-    POSTGRES_USER = os.environ.get("POSTGRES_USER", "postgres_dev")
-    POSTGRES_PASSWORD = os.environ.get("POSTGRES_PASSWORD", "secret_dev")
+    # Database (DB_* as passed by docker-compose, POSTGRES_* as a fallback)
+    DB_NAME = os.environ.get("DB_NAME", os.environ.get("POSTGRES_DB", "knowyourhero_dev"))
+    DB_USER = os.environ.get("DB_USER", os.environ.get("POSTGRES_USER", "postgres_dev"))
+    DB_PASSWORD = os.environ.get(
+        "DB_PASSWORD", os.environ.get("POSTGRES_PASSWORD", "secret_dev")
+    )
     DB_HOST = os.environ.get("DB_HOST", "localhost")
     DB_PORT = os.environ.get("DB_PORT", "5432")
-    SQLALCHEMY_DATABASE_URI = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{DB_HOST}:{DB_PORT}/{POSTGRES_DB}"
+    SQLALCHEMY_DATABASE_URI = os.environ.get(
+        "DATABASE_URL",
+        f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}",
+    )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Connection pools, per process. Under asgi.py each process has two pools
+    # of this size (sync engine for writes, async engine for reads), so a
+    # worker can hold up to 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections;
+    # size workers against Postgres max_connections accordingly
+    DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT_SECONDS = int(os.environ.get("DB_POOL_TIMEOUT_SECONDS", 30))
+    DB_POOL_RECYCLE_SECONDS = int(
+        os.environ.get("DB_POOL_RECYCLE_SECONDS", 1800)
+    )  # 30 minutes
+    DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_POOL_SLOW_CHECKOUT_MS = int(os.environ.get("DB_POOL_SLOW_CHECKOUT_MS", 100))
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get("DB_STATEMENT_TIMEOUT_MS", 30000))
+
     DEBUG = False
 
     # JWT
@@ -23,12 +42,80 @@ class Config:
         os.environ.get("REFRESH_TOKEN_EXPIRES_SECONDS", 2592000)
     )  # 30 days
 
+    # Purge of expired/revoked refresh tokens (interval 0 disables the in-process job)
+    TOKEN_PURGE_BATCH_SIZE = int(os.environ.get("TOKEN_PURGE_BATCH_SIZE", 1000))
+    TOKEN_JANITOR_INTERVAL_SECONDS = int(
+        os.environ.get("TOKEN_JANITOR_INTERVAL_SECONDS", 0)
+    )
+
     # Login lockout
     LOCKOUT_ATTEMPTS = int(os.environ.get("LOCKOUT_ATTEMPTS", 10))
     LOCKOUT_DURATION_SECONDS = int(
         os.environ.get("LOCKOUT_DURATION_SECONDS", 300)
     )  # 5 minutes
 
+    # Password hashing (werkzeug method string, e.g. "scrypt:32768:8:1")
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_HASH_EXECUTOR = os.environ.get(
+        "PASSWORD_HASH_EXECUTOR", "thread"
+    )  # "thread" or "process"
+    PASSWORD_HASH_WORKERS = int(
+        os.environ.get("PASSWORD_HASH_WORKERS", os.cpu_count() or 1)
+    )
+    PASSWORD_HASH_MAX_QUEUE = int(os.environ.get("PASSWORD_HASH_MAX_QUEUE", 32))
+    PASSWORD_HASH_TIMEOUT_SECONDS = float(
+        os.environ.get("PASSWORD_HASH_TIMEOUT_SECONDS", 10)
+    )
+
+    # Cache of user ids known to exist, used by token verification
+    USER_CACHE_MAX_SIZE = int(os.environ.get("USER_CACHE_MAX_SIZE", 10000))
+    USER_CACHE_TTL_SECONDS = int(os.environ.get("USER_CACHE_TTL_SECONDS", 60))
+
+    # Sliding-window limits on auth endpoints, checked before any database or
+    # hashing work (requests per window; 0 disables a rule)
+    RATE_LIMIT_BACKEND = os.environ.get(
+        "RATE_LIMIT_BACKEND", "utils.cache_backends.InMemoryBackend"
+    )
+    RATE_LIMIT_MAX_SIZE = int(os.environ.get("RATE_LIMIT_MAX_SIZE", 100000))
+    RATE_LIMIT_WINDOW_SECONDS = int(os.environ.get("RATE_LIMIT_WINDOW_SECONDS", 60))
+    LOGIN_RATE_LIMIT_PER_IP = int(os.environ.get("LOGIN_RATE_LIMIT_PER_IP", 30))
+    LOGIN_RATE_LIMIT_PER_EMAIL = int(os.environ.get("LOGIN_RATE_LIMIT_PER_EMAIL", 10))
+    REGISTER_RATE_LIMIT_PER_IP = int(os.environ.get("REGISTER_RATE_LIMIT_PER_IP", 10))
+
+    # Requests slower than this are logged with their slowest SQL statements
+    # (0 disables the log); statements kept per request for that log
+    SLOW_REQUEST_MS = int(os.environ.get("SLOW_REQUEST_MS", 1000))
+    SLOW_REQUEST_MAX_STATEMENTS = int(os.environ.get("SLOW_REQUEST_MAX_STATEMENTS", 20))
+
+    # Serve request, cache and pool metrics at /metrics (Prometheus format).
+    # The endpoint is unauthenticated; only enable it where the port is private.
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "false").lower() == "true"
+
+    # Threads for sync views when served through asgi.py (async views run on
+    # the event loop and are not limited by it)
+    ASGI_MAX_THREADS = int(os.environ.get("ASGI_MAX_THREADS", 50))
+
+    # Cache-Control for conditional GET endpoints; responses depend on the
+    # auth cookie, so only the browser may cache them and must revalidate
+    HTTP_CACHE_CONTROL = os.environ.get("HTTP_CACHE_CONTROL", "private, no-cache")
+
+    # Shared cache of serialized review feed pages (TTL 0 disables it)
+    FEED_CACHE_BACKEND = os.environ.get(
+        "FEED_CACHE_BACKEND", "utils.cache_backends.InMemoryBackend"
+    )
+    FEED_CACHE_MAX_SIZE = int(os.environ.get("FEED_CACHE_MAX_SIZE", 1000))
+    FEED_CACHE_TTL_SECONDS = int(os.environ.get("FEED_CACHE_TTL_SECONDS", 30))
+
+    # Maximum reviews accepted by POST /api/reviews/batch
+    REVIEW_BATCH_MAX_ITEMS = int(os.environ.get("REVIEW_BATCH_MAX_ITEMS", 100))
+
+    # Rows fetched per server-side cursor batch by GET /api/reviews/export
+    EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", 1000))
+
+    # Pagination
+    DEFAULT_PAGE_SIZE = int(os.environ.get("DEFAULT_PAGE_SIZE", 50))
+    MAX_PAGE_SIZE = int(os.environ.get("MAX_PAGE_SIZE", 200))
+
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -42,6 +129,7 @@ class DevelopmentConfig(Config):
 class TestingConfig(Config):
     TESTING = True
     DEBUG = True
+    PASSWORD_HASH_METHOD = "pbkdf2:sha256:1000"  # cheap hashes for tests
     LOCKOUT_DURATION_SECONDS = int(
         os.environ.get("LOCKOUT_DURATION_SECONDS", 300)
     )  # 5 minutes
@@ -27,13 +27,20 @@ class InvalidCredentialsError(APIError):
 
 
 class TooManyAttemptsError(APIError):
-    def __init__(self):
+    def __init__(self, retry_after=None):
+        self.retry_after = retry_after
         super().__init__(
             "Too many login attempts. Try again later",
             429,
             ErrorCodes.TOO_MANY_ATTEMPTS,
         )
 
+    def to_response(self):
+        body, status = super().to_response()
+        if self.retry_after is None:
+            return body, status
+        return body, status, {"Retry-After": str(self.retry_after)}
+
 
 class MissingFieldsError(APIError):
     def __init__(self, fields=None):
@@ -92,6 +99,23 @@ class InvalidEmailFormat(APIError):
         super().__init__("Invalid email format", 400, ErrorCodes.INVALID_EMAIL_FORMAT)
 
 
+class InvalidQueryParamError(APIError):
+    def __init__(self, param):
+        super().__init__(
+            f"Invalid value for query parameter: {param}",
+            400,
+            ErrorCodes.INVALID_QUERY_PARAM,
+        )
+
+
+class InvalidFieldError(APIError):
+    def __init__(self, field, detail=None):
+        message = f"Invalid value for field: {field}"
+        if detail:
+            message += f" ({detail})"
+        super().__init__(message, 400, ErrorCodes.INVALID_FIELD)
+
+
 # Token errors
 class MissingTokenError(APIError):
     def __init__(self, token):
@@ -192,6 +216,15 @@ class MaxLimitExceededError(APIError):
         )
 
 
+class BatchTooLargeError(APIError):
+    def __init__(self, limit):
+        super().__init__(
+            f"Too many reviews in one batch: maximum is {limit}",
+            400,
+            ErrorCodes.BATCH_TOO_LARGE,
+        )
+
+
 # Server errors
 class ServerError(APIError):
     def __init__(self, detail=None):
@@ -208,3 +241,18 @@ class DatabaseError(APIError):
         if detail:
             message = f"Database error: {detail}"
         super().__init__(message, 500, ErrorCodes.DATABASE_ERROR)
+
+
+class ServiceBusyError(APIError):
+    def __init__(self, retry_after=1):
+        self.retry_after = retry_after
+        super().__init__(
+            "Server is busy. Please try again later", 503, ErrorCodes.SERVER_BUSY
+        )
+
+    def to_response(self):
+        return (
+            jsonify({"error": {"code": self.error_code, "message": self.message}}),
+            self.status_code,
+            {"Retry-After": str(self.retry_after)},
+        )
@@ -8,6 +8,8 @@ class ErrorCodes:
     ACCOUNT_LOCKED = 1011
     USER_NOT_FOUND = 1013
     INVALID_EMAIL_FORMAT = 1014
+    INVALID_QUERY_PARAM = 1015
+    INVALID_FIELD = 1016
 
     # Token errors (1020-1039)
     MISSING_TOKEN = 1020
@@ -25,7 +27,9 @@ class ErrorCodes:
     REVIEW_TARGET_NOT_FOUND = 4001
     SELF_REVIEW_NOT_ALLOWED = 4002
     MAX_LIMIT_EXCEEDED = 4003
+    BATCH_TOO_LARGE = 4004
 
     # Server errors (5000-5099)
     SERVER_ERROR = 5001
     DATABASE_ERROR = 5002
+    SERVER_BUSY = 5003
@@ -0,0 +1,104 @@
+"""initial schema
+
+Matches the tables that init_db() used to create with metadata.create_all.
+Databases created that way already have them, so existing tables are skipped.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if context.is_offline_mode():
+        existing = set()
+    else:
+        existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column(
+                "id",
+                postgresql.UUID(as_uuid=True),
+                server_default=sa.text("gen_random_uuid()"),
+                primary_key=True,
+            ),
+            sa.Column("email", sa.String(120), nullable=False, unique=True),
+            sa.Column("name", sa.String(256), nullable=False),
+            sa.Column("password_hash", sa.String(256), nullable=False),
+            sa.Column("role", sa.String(20), nullable=False),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("updated_at", sa.DateTime()),
+            sa.Column("failed_login_attempts", sa.Integer(), nullable=False),
+            sa.Column("lock_login_until", sa.DateTime(timezone=True)),
+        )
+
+    if "refresh_token" not in existing:
+        op.create_table(
+            "refresh_token",
+            sa.Column(
+                "id",
+                postgresql.UUID(as_uuid=True),
+                server_default=sa.text("gen_random_uuid()"),
+                primary_key=True,
+            ),
+            sa.Column(
+                "user_id",
+                postgresql.UUID(as_uuid=True),
+                sa.ForeignKey("users.id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column("token_hash", sa.String(512), nullable=False),
+            sa.Column("expires_at", sa.DateTime(), nullable=False),
+            sa.Column("is_revoked", sa.Boolean(), nullable=False),
+        )
+
+    op.create_index(
+        "ix_refresh_token_token_hash",
+        "refresh_token",
+        ["token_hash"],
+        unique=True,
+        if_not_exists=True,
+    )
+
+    if "reviews" not in existing:
+        op.create_table(
+            "reviews",
+            sa.Column(
+                "id",
+                postgresql.UUID(as_uuid=True),
+                server_default=sa.text("gen_random_uuid()"),
+                primary_key=True,
+            ),
+            sa.Column("positive", sa.String(1000)),
+            sa.Column("negative", sa.String(1000)),
+            sa.Column(
+                "recipient_id",
+                postgresql.UUID(as_uuid=True),
+                sa.ForeignKey("users.id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column(
+                "author_id",
+                postgresql.UUID(as_uuid=True),
+                sa.ForeignKey("users.id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column("created_at", sa.DateTime()),
+        )
+
+
+def downgrade():
+    op.drop_table("reviews")
+    op.drop_table("refresh_token")
+    op.drop_table("users")
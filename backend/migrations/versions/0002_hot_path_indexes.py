@@ -0,0 +1,56 @@
+"""indexes for the hot query paths
+
+- reviews (created_at, id): keyset pagination of GET /api/reviews
+- reviews recipient_id / author_id: FK lookups and ON DELETE CASCADE
+- refresh_token user_id WHERE NOT is_revoked: revoking a user's active
+  tokens on login (the revoked_tokens CTE in store_refresh_token)
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # built concurrently so existing tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_reviews_created_at_id",
+            "reviews",
+            ["created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_reviews_recipient_id",
+            "reviews",
+            ["recipient_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_reviews_author_id",
+            "reviews",
+            ["author_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_refresh_token_user_id_active",
+            "refresh_token",
+            ["user_id"],
+            postgresql_where=sa.text("NOT is_revoked"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    op.drop_index("ix_refresh_token_user_id_active", table_name="refresh_token")
+    op.drop_index("ix_reviews_author_id", table_name="reviews")
+    op.drop_index("ix_reviews_recipient_id", table_name="reviews")
+    op.drop_index("ix_reviews_created_at_id", table_name="reviews")
@@ -0,0 +1,46 @@
+"""composite indexes for per-recipient and per-author review pages
+
+Replaces the single-column recipient_id / author_id indexes from 0002 with
+(recipient_id, created_at, id) and (author_id, created_at, id), which serve
+both the filtered keyset pages and the FK cascades.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_reviews_recipient_id_created_at_id",
+            "reviews",
+            ["recipient_id", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_reviews_author_id_created_at_id",
+            "reviews",
+            ["author_id", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_reviews_recipient_id", table_name="reviews", postgresql_concurrently=True
+        )
+        op.drop_index(
+            "ix_reviews_author_id", table_name="reviews", postgresql_concurrently=True
+        )
+
+
+def downgrade():
+    op.create_index("ix_reviews_recipient_id", "reviews", ["recipient_id"])
+    op.create_index("ix_reviews_author_id", "reviews", ["author_id"])
+    op.drop_index("ix_reviews_author_id_created_at_id", table_name="reviews")
+    op.drop_index("ix_reviews_recipient_id_created_at_id", table_name="reviews")
@@ -0,0 +1,42 @@
+"""indexes for the paginated, searchable user directory
+
+- users (name, id): keyset pagination of GET /api/users
+- lower(name) / email with text_pattern_ops: prefix search (q=) with LIKE 'q%'
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_name_id", "users", ["name", "id"], postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_users_lower_name_prefix",
+            "users",
+            [sa.text("lower(name) text_pattern_ops")],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_users_email_prefix",
+            "users",
+            [sa.text("email text_pattern_ops")],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    op.drop_index("ix_users_email_prefix", table_name="users")
+    op.drop_index("ix_users_lower_name_prefix", table_name="users")
+    op.drop_index("ix_users_name_id", table_name="users")
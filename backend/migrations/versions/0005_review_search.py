@@ -0,0 +1,69 @@
+"""full-text search over review text
+
+- reviews.search_positive: tsvector of the positive text, searched for roles
+  that may not see negative text
+- reviews.search_all: positive (weight A) and negative (weight B) text
+- GIN indexes on both
+
+The columns are generated (STORED), so Postgres keeps them in sync on every
+write. Adding them rewrites the reviews table under an exclusive lock.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+SEARCH_POSITIVE = "to_tsvector('english', coalesce(positive, ''))"
+SEARCH_ALL = (
+    "setweight(to_tsvector('english', coalesce(positive, '')), 'A')"
+    " || setweight(to_tsvector('english', coalesce(negative, '')), 'B')"
+)
+
+
+def upgrade():
+    op.add_column(
+        "reviews",
+        sa.Column(
+            "search_positive",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_POSITIVE, persisted=True),
+        ),
+    )
+    op.add_column(
+        "reviews",
+        sa.Column(
+            "search_all", postgresql.TSVECTOR(), sa.Computed(SEARCH_ALL, persisted=True)
+        ),
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_reviews_search_positive",
+            "reviews",
+            ["search_positive"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_reviews_search_all",
+            "reviews",
+            ["search_all"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    op.drop_index("ix_reviews_search_all", table_name="reviews")
+    op.drop_index("ix_reviews_search_positive", table_name="reviews")
+    op.drop_column("reviews", "search_all")
+    op.drop_column("reviews", "search_positive")
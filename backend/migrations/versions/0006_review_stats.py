@@ -0,0 +1,85 @@
+"""per-user review counters
+
+- review_stats: reviews received / authored (total, with positive text, with
+  negative text) and the latest review time on each side, one row per user
+  that has any reviews; maintained by the review write paths
+- backfilled from the existing reviews (`flask stats rebuild` recomputes it)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+COUNTERS = [
+    "reviews_received",
+    "positive_received",
+    "negative_received",
+    "reviews_authored",
+    "positive_authored",
+    "negative_authored",
+]
+
+BACKFILL = """
+INSERT INTO review_stats (
+    user_id,
+    reviews_received, positive_received, negative_received,
+    reviews_authored, positive_authored, negative_authored,
+    last_received_at, last_authored_at
+)
+SELECT
+    user_id,
+    count(*) FILTER (WHERE received),
+    count(*) FILTER (WHERE received AND has_positive),
+    count(*) FILTER (WHERE received AND has_negative),
+    count(*) FILTER (WHERE NOT received),
+    count(*) FILTER (WHERE NOT received AND has_positive),
+    count(*) FILTER (WHERE NOT received AND has_negative),
+    max(created_at) FILTER (WHERE received),
+    max(created_at) FILTER (WHERE NOT received)
+FROM (
+    SELECT recipient_id AS user_id, true AS received, created_at,
+           coalesce(positive, '') <> '' AS has_positive,
+           coalesce(negative, '') <> '' AS has_negative
+    FROM reviews
+    UNION ALL
+    SELECT author_id, false, created_at,
+           coalesce(positive, '') <> '',
+           coalesce(negative, '') <> ''
+    FROM reviews
+) AS review_sides
+GROUP BY user_id
+"""
+
+
+def upgrade():
+    op.create_table(
+        "review_stats",
+        sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        *[
+            sa.Column(name, sa.Integer(), nullable=False, server_default="0")
+            for name in COUNTERS
+        ],
+        sa.Column("last_received_at", sa.DateTime(), nullable=True),
+        sa.Column("last_authored_at", sa.DateTime(), nullable=True),
+    )
+    # reviews written while this runs wait for the migration's commit
+    op.execute("LOCK TABLE reviews IN SHARE MODE")
+    op.execute(BACKFILL)
+
+
+def downgrade():
+    op.drop_table("review_stats")
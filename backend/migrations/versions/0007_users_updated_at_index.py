@@ -0,0 +1,27 @@
+"""index for the users version in response ETags
+
+- users (updated_at): max(updated_at) is part of the review feed ETag, whose
+  items carry user names, and of the user directory ETag
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_updated_at", "users", ["updated_at"], postgresql_concurrently=True
+        )
+
+
+def downgrade():
+    op.drop_index("ix_users_updated_at", table_name="users")
@@ -0,0 +1,43 @@
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from models.models import engine_options
+from models.pool import InstrumentedAsyncQueuePool
+from utils.metrics import track_queries
+
+async_engine = None
+AsyncSessionLocal = async_sessionmaker(expire_on_commit=False)
+
+
+def init_async_engine(config, pooled=False):
+    """
+    Creates the asyncpg engine from the app config and binds AsyncSessionLocal.
+    Async views served by the WSGI dev server (`python app.py`) get a fresh
+    event loop per request, and asyncpg connections cannot outlive their loop,
+    so pooling is only enabled when everything runs on one loop (asgi.py,
+    which is how the app is deployed).
+    """
+    global async_engine
+
+    url = config["SQLALCHEMY_DATABASE_URI"].replace(
+        "postgresql://", "postgresql+asyncpg://", 1
+    )
+    connect_args = {
+        "server_settings": {"statement_timeout": str(config["DB_STATEMENT_TIMEOUT_MS"])}
+    }
+
+    if pooled:
+        async_engine = create_async_engine(
+            url,
+            poolclass=InstrumentedAsyncQueuePool,
+            connect_args=connect_args,
+            **engine_options(config),
+        )
+        async_engine.pool.slow_checkout_seconds = config["DB_POOL_SLOW_CHECKOUT_MS"] / 1000
+    else:
+        async_engine = create_async_engine(
+            url, connect_args=connect_args, poolclass=NullPool
+        )
+    track_queries(async_engine.sync_engine)
+    AsyncSessionLocal.configure(bind=async_engine)
+    return async_engine
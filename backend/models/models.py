@@ -1,20 +1,19 @@
-import os
+import hashlib
+import hmac
 from datetime import datetime, timezone
 
+from flask import current_app
+
 from sqlalchemy.orm import DeclarativeBase, sessionmaker, relationship, mapped_column
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, text
-from sqlalchemy import create_engine
-from sqlalchemy.dialects.postgresql import UUID
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Index, Computed, text
+from sqlalchemy import create_engine, func
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from werkzeug.security import check_password_hash
 
-# load variables for database connection
-DB_USER = os.environ.get("DB_USER")
-DB_PASSWORD = os.environ.get("DB_PASSWORD")
-DB_HOST = os.environ.get("DB_HOST")
-DB_PORT = os.environ.get("DB_PORT")
-DB_NAME = os.environ.get("DB_NAME")
+from utils.hashing import password_hasher
+from utils.metrics import track_queries
 
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+from models.pool import InstrumentedQueuePool
 
 
 class Base(DeclarativeBase):
@@ -27,6 +26,21 @@ class User(Base):
     """Defines the structure of the 'users' table in the database."""
 
     __tablename__ = "users"
+    __table_args__ = (
+        # keyset pagination of the user directory orders by (name, id)
+        Index("ix_users_name_id", "name", "id"),
+        # prefix search (q=) on the user directory
+        Index(
+            "ix_users_lower_name_prefix",
+            func.lower(text("name")).label("lower_name"),
+            postgresql_ops={"lower_name": "text_pattern_ops"},
+        ),
+        Index(
+            "ix_users_email_prefix", "email", postgresql_ops={"email": "text_pattern_ops"}
+        ),
+        # max(updated_at) versions ETags of responses that carry user names
+        Index("ix_users_updated_at", "updated_at"),
+    )
 
     # Define table attributes
     id = mapped_column(
@@ -38,28 +52,37 @@ class User(Base):
     name = Column(String(256), nullable=False)
     password_hash = Column(String(256), nullable=False)
     role = Column(String(20), nullable=False, default="collegue")
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(
         DateTime,
-        default=datetime.now(timezone.utc),
-        onupdate=datetime.now(timezone.utc),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
     )
     failed_login_attempts = Column(Integer, nullable=False, default=0)
     lock_login_until = Column(DateTime(timezone=True), nullable=True)
 
     def set_password(self, password):
-        """Hashes and sets the user's password."""
-        self.password_hash = generate_password_hash(password)
+        """Hashes and sets the user's password on the password hashing pool."""
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
         """Checks if the provided password matches the stored hash."""
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.check(self.password_hash, password)
 
 
 class RefreshToken(Base):
     """Defines the structure of the 'refresh_token' table in the database."""
 
     __tablename__ = "refresh_token"
+    __table_args__ = (
+        # the revoked_tokens CTE of store_refresh_token (login) only ever
+        # touches a user's active tokens
+        Index(
+            "ix_refresh_token_user_id_active",
+            "user_id",
+            postgresql_where=text("NOT is_revoked"),
+        ),
+    )
 
     id = mapped_column(
         UUID(as_uuid=True),
@@ -71,17 +94,30 @@ class RefreshToken(Base):
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
     )
-    token_hash = Column(String(512), nullable=False)
+    token_hash = Column(String(512), nullable=False, unique=True, index=True)
     expires_at = Column(DateTime, nullable=False)
     is_revoked = Column(Boolean, default=False, nullable=False)
 
+    @staticmethod
+    def digest(token):
+        """
+        Returns the HMAC-SHA256 hex digest of a refresh_token.
+        The token is already a high-entropy signed JWT, so a keyed digest is
+        enough and can be looked up directly through the unique index.
+        """
+        key = current_app.config["SECRET_KEY"].encode()
+        return hmac.new(key, token.encode(), hashlib.sha256).hexdigest()
+
     def set_token(self, token):
         """Hashes and sets the refresh_token."""
-        self.token_hash = generate_password_hash(token)
+        self.token_hash = self.digest(token)
 
     def check_token(self, token):
         """Checks if the provided refresh_token matches the stored hash."""
-        return check_password_hash(self.token_hash, token)
+        # rows written before the switch to HMAC hold werkzeug "method$salt$hash" values
+        if "$" in self.token_hash:
+            return check_password_hash(self.token_hash, token)
+        return hmac.compare_digest(self.token_hash, self.digest(token))
 
     # relationships
     user = relationship("User", foreign_keys=[user_id])
@@ -91,6 +127,16 @@ class Review(Base):
     """Defines the structure of the 'reviews' table in the database."""
 
     __tablename__ = "reviews"
+    __table_args__ = (
+        # keyset pagination of the feed orders by (created_at, id)
+        Index("ix_reviews_created_at_id", "created_at", "id"),
+        # per-recipient / per-author pages; the leading column also serves FK cascades
+        Index("ix_reviews_recipient_id_created_at_id", "recipient_id", "created_at", "id"),
+        Index("ix_reviews_author_id_created_at_id", "author_id", "created_at", "id"),
+        # full-text search (GET /api/reviews/search)
+        Index("ix_reviews_search_positive", "search_positive", postgresql_using="gin"),
+        Index("ix_reviews_search_all", "search_all", postgresql_using="gin"),
+    )
 
     id = mapped_column(
         UUID(as_uuid=True),
@@ -109,7 +155,24 @@ class Review(Base):
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
     )
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    # search vectors maintained by Postgres: positive text only, for roles that
+    # may not see negative text, and positive (weight A) plus negative (B)
+    search_positive = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(positive, ''))", persisted=True),
+        deferred=True,
+    )
+    search_all = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(positive, '')), 'A')"
+            " || setweight(to_tsvector('english', coalesce(negative, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     # relationships
     recipient = relationship(
@@ -118,11 +181,58 @@ class Review(Base):
     author = relationship("User", foreign_keys=[author_id])  # Connects to review author
 
 
-# Database setup
-engine = create_engine(DATABASE_URL)
-Session = sessionmaker(bind=engine)
+class ReviewStats(Base):
+    """
+    Per-user review counters, kept up to date in the transactions that write
+    reviews (utils/review_stats.py) and rebuilt with `flask stats rebuild`.
+    """
 
+    __tablename__ = "review_stats"
 
-def init_db():
-    """Initializes the database by creating all tables."""
-    Base.metadata.create_all(engine)
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    reviews_received = Column(Integer, nullable=False, default=0, server_default="0")
+    positive_received = Column(Integer, nullable=False, default=0, server_default="0")
+    negative_received = Column(Integer, nullable=False, default=0, server_default="0")
+    reviews_authored = Column(Integer, nullable=False, default=0, server_default="0")
+    positive_authored = Column(Integer, nullable=False, default=0, server_default="0")
+    negative_authored = Column(Integer, nullable=False, default=0, server_default="0")
+    last_received_at = Column(DateTime, nullable=True)
+    last_authored_at = Column(DateTime, nullable=True)
+
+
+# Database setup; the engine is bound by init_engine() from the app config
+engine = None
+Session = sessionmaker()
+
+
+def engine_options(config):
+    """Pool and connection options shared by the sync and async engines."""
+    return {
+        "pool_size": config["DB_POOL_SIZE"],
+        "max_overflow": config["DB_MAX_OVERFLOW"],
+        "pool_timeout": config["DB_POOL_TIMEOUT_SECONDS"],
+        "pool_recycle": config["DB_POOL_RECYCLE_SECONDS"],
+        "pool_pre_ping": config["DB_POOL_PRE_PING"],
+    }
+
+
+def init_engine(config):
+    """Creates the engine from the app config and binds Session to it."""
+    global engine
+
+    engine = create_engine(
+        config["SQLALCHEMY_DATABASE_URI"],
+        poolclass=InstrumentedQueuePool,
+        connect_args={
+            "options": f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT_MS']}"
+        },
+        **engine_options(config),
+    )
+    engine.pool.slow_checkout_seconds = config["DB_POOL_SLOW_CHECKOUT_MS"] / 1000
+    track_queries(engine)
+    Session.configure(bind=engine)
+    return engine
@@ -0,0 +1,93 @@
+import logging
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """Counters for connection checkouts: how many, how long they waited, timeouts."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, waited, timed_out=False):
+        with self._lock:
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+            }
+
+
+class CheckoutTimingMixin:
+    """
+    Pool mixin that records how long each checkout waited for a connection
+    and logs checkouts slower than slow_checkout_seconds.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        self.slow_checkout_seconds = None
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        pool.slow_checkout_seconds = self.slow_checkout_seconds
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        waited = time.perf_counter() - start
+        self.stats.record(waited)
+
+        if self.slow_checkout_seconds is not None and waited > self.slow_checkout_seconds:
+            logger.warning(
+                "Slow connection checkout: waited %.3fs (%s)", waited, self.status()
+            )
+        return connection
+
+
+class InstrumentedQueuePool(CheckoutTimingMixin, QueuePool):
+    """QueuePool of the sync engine, with checkout timing."""
+
+
+class InstrumentedAsyncQueuePool(CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """asyncio queue pool of the async engine, with checkout timing."""
+
+
+def pool_status(pool):
+    """Returns current pool occupancy and checkout stats for an engine's pool."""
+    status = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+    }
+    capacity = status["size"] + status["max_overflow"]
+    status["saturation"] = status["checked_out"] / capacity if capacity else 0.0
+    status.update(pool.stats.snapshot())
+    return status
@@ -1,4 +1,4 @@
-from datetime import timedelta, timezone
+from datetime import timezone
 
 import jwt
 from errors.api_errors import (
@@ -9,18 +9,34 @@ from errors.api_errors import (
     UserNotFoundError,
 )
 from flask import Blueprint, current_app, jsonify, request
-from models.models import Session, User
-from sqlalchemy import func, select
+from models.async_db import AsyncSessionLocal
+from models.models import ReviewStats, Session, User
+from sqlalchemy import func, insert, or_, select, tuple_
+from sqlalchemy.exc import IntegrityError
 from utils.auth_utils import (
-    check_user_locked,
     create_auth_response,
     decode_token,
+    record_failed_login,
     revoke_refresh_token,
-    revoke_user_refresh_tokens,
     validate_email_format,
     verify_token,
+    verify_token_async,
 )
-from utils.general_utils import check_required_fields
+from utils.general_utils import (
+    check_required_fields,
+    escape_like,
+    violated_constraint,
+)
+from utils.hashing import password_hasher
+from utils.http_cache import (
+    add_cache_headers,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+)
+from utils.pagination import encode_cursor, get_cursor, get_page_size
+from utils.rate_limit import rate_limiter
+from utils.review_stats import serialize_stats, stats_columns
 
 # Initialize the Flask application
 auth_bp = Blueprint("auth_bp", __name__)
@@ -34,43 +50,46 @@ def register():
     """
     data = request.get_json()
 
+    rate_limiter.hit("register_ip", request.remote_addr)
+
     required_fields = ["email", "name", "password"]
     check_required_fields(data, required_fields)
 
     email = data["email"].strip().lower()
     validate_email_format(email)
 
+    password_hash = password_hasher.hash(data["password"])
+
+    # one INSERT ... RETURNING; duplicates are caught by the unique email constraint
     with Session.begin() as session:
-        # check if a user with the given email already exists
-        if session.execute(
-            select(User.id).where(User.email == email)
-        ).scalar_one_or_none():
-            raise EmailExistsError()
-
-        # create a new user instance
-        new_user = User(
-            email=email,
-            name=data["name"].strip(),
-            role="colleague",
-        )
-        new_user.set_password(data["password"])
-
-        session.add(new_user)
-        session.flush()
-        session.refresh(new_user, attribute_names=["id", "created_at"])
-
-        return (
-            jsonify(
-                {
-                    "id": str(new_user.id),
-                    "email": new_user.email,
-                    "name": new_user.name,
-                    "role": new_user.role,
-                    "created_at": new_user.created_at if new_user.created_at else None,
-                }
-            ),
-            201,
-        )
+        try:
+            new_user = session.execute(
+                insert(User)
+                .values(
+                    email=email,
+                    name=data["name"].strip(),
+                    role="colleague",
+                    password_hash=password_hash,
+                )
+                .returning(User.id, User.email, User.name, User.role, User.created_at)
+            ).one()
+        except IntegrityError as e:
+            if violated_constraint(e) in (None, "users_email_key"):
+                raise EmailExistsError()
+            raise
+
+    return (
+        jsonify(
+            {
+                "id": str(new_user.id),
+                "email": new_user.email,
+                "name": new_user.name,
+                "role": new_user.role,
+                "created_at": new_user.created_at,
+            }
+        ),
+        201,
+    )
 
 
 @auth_bp.route("/api/auth/login", methods=["POST"])
@@ -88,87 +107,170 @@ def login():
     email = data["email"].strip().lower()
     validate_email_format(email)
 
+    # reject bursts before touching the database or the password hasher
+    rate_limiter.hit("login_ip", request.remote_addr)
+    rate_limiter.hit("login_email", email)
+
     with Session() as session:
-        # check if email exists in database
+        # check if email exists in database and if the account is blocked
         user = session.execute(
-            select(User).where(User.email == email)
-        ).scalar_one_or_none()
-        if not user:
-            raise InvalidCredentialsError()
-
-        # check if accont is blocked
-        retry_after = check_user_locked(session, user)
-        if retry_after is not None:
-            lock_until_utc = user.lock_login_until.astimezone(timezone.utc)
-            raise AccountLockError(lock_until_utc)
-
-        # check if password is correct
-        if not user.check_password(data["password"]):
-            attempts = (user.failed_login_attempts or 0) + 1
-            limit = current_app.config["LOCKOUT_ATTEMPTS"]
-
-            if attempts >= limit:
-                duration = current_app.config["LOCKOUT_DURATION_SECONDS"]
-                db_now = session.execute(select(func.now())).scalar_one()  # get DB time
-                user.failed_login_attempts = 0
-                user.lock_login_until = db_now + timedelta(seconds=duration)
-            else:
-                user.failed_login_attempts = attempts
-
-            session.commit()
-            raise InvalidCredentialsError()
-
-        revoke_user_refresh_tokens(session, user.id)
-
-        user.failed_login_attempts = 0
-        session.commit()
-
-        return create_auth_response("Login successful", user)
+            select(
+                User.id,
+                User.role,
+                User.password_hash,
+                User.lock_login_until,
+                (User.lock_login_until > func.now()).label("is_locked"),
+            ).where(User.email == email)
+        ).one_or_none()
+    if not user:
+        raise InvalidCredentialsError()
+
+    if user.is_locked:
+        lock_until_utc = user.lock_login_until.astimezone(timezone.utc)
+        raise AccountLockError(lock_until_utc)
+
+    # check if password is correct; no connection is held while hashing
+    if not password_hasher.check(user.password_hash, data["password"]):
+        with Session.begin() as session:
+            record_failed_login(session, user.id)
+        raise InvalidCredentialsError()
+
+    # revoke old tokens, reset attempts and store the new refresh token together
+    with Session.begin() as session:
+        return create_auth_response("Login successful", user, session=session, login=True)
 
 
 @auth_bp.route("/api/users", methods=["GET"])
-def get_users():
-    """Retrieves a list of all users with their id, name, and email."""
+async def get_users():
+    """
+    Retrieves users other than the caller (id, name, email), ordered by name,
+    one page at a time. `q` keeps users whose name or email starts with it.
+    """
 
-    token_payload = verify_token(request, "access_token")
+    token_payload = await verify_token_async(request, "access_token")
     user_id = token_payload.get("user_id")
 
-    with Session() as session:
-        users = session.execute(select(User).where(User.id != user_id)).scalars().all()
-        return jsonify(
-            [
-                {"id": str(user.id), "name": user.name, "email": user.email}
-                for user in users
-            ]
+    limit = get_page_size(request.args)
+    cursor = get_cursor(request.args, parse_key=str)
+
+    query = (
+        select(User.id, User.name, User.email)
+        .where(User.id != user_id)
+        .order_by(User.name, User.id)
+        .limit(limit + 1)  # one extra row tells us whether a next page exists
+    )
+    if cursor is not None:
+        query = query.where(tuple_(User.name, User.id) > cursor)
+
+    search = (request.args.get("q") or "").strip().lower()
+    if search:
+        # prefix matches, served by the text_pattern_ops indexes on users
+        pattern = escape_like(search) + "%"
+        query = query.where(
+            or_(
+                func.lower(User.name).like(pattern, escape="\\"),
+                User.email.like(pattern, escape="\\"),
+            )
+        )
+
+    async with AsyncSessionLocal() as session:
+        # new and edited users move max(updated_at), an ix_users_updated_at
+        # probe; counting the table here would scan it on every keystroke
+        last_updated_at = (
+            await session.execute(select(func.max(User.updated_at)))
+        ).scalar_one()
+        etag = make_etag("users", user_id, request.query_string, last_updated_at)
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+
+        users = (await session.execute(query)).all()
+
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = encode_cursor(users[-1].name, users[-1].id)
+
+        response = jsonify(
+            {
+                "items": [
+                    {"id": str(user.id), "name": user.name, "email": user.email}
+                    for user in users
+                ],
+                "next_cursor": next_cursor,
+            }
         )
+        return add_cache_headers(response, etag)
 
 
 @auth_bp.route("/api/me", methods=["GET"])
-def get_user():
+async def get_user():
     """Fetches information about the currently authorized user based on the JWT token in the request."""
 
-    token_payload = verify_token(request, "access_token")
+    token_payload = await verify_token_async(request, "access_token")
     user_id = token_payload.get("user_id")
 
-    with Session() as session:
-        user = session.execute(
-            select(User).where(User.id == user_id)
-        ).scalar_one_or_none()
+    async with AsyncSessionLocal() as session:
+        user = (
+            await session.execute(
+                select(
+                    User.id, User.name, User.email, User.role, User.created_at,
+                    *stats_columns(),
+                )
+                .outerjoin(ReviewStats, ReviewStats.user_id == User.id)
+                .where(User.id == user_id)
+            )
+        ).one_or_none()
         if not user:
             raise UserNotFoundError()
 
-        return (
-            jsonify(
-                {
-                    "id": str(user.id),
-                    "name": user.name,
-                    "email": user.email,
-                    "role": user.role,
-                    "created_at": user.created_at,
-                }
-            ),
-            200,
+        etag = make_etag("me", *user)
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+
+        response = jsonify(
+            {
+                "id": str(user.id),
+                "name": user.name,
+                "email": user.email,
+                "role": user.role,
+                "created_at": user.created_at,
+                "stats": serialize_stats(user, user.role, own=True),
+            }
+        )
+        return add_cache_headers(response, etag), 200
+
+
+@auth_bp.route("/api/users/<uuid:target_id>/stats", methods=["GET"])
+async def get_user_stats(target_id):
+    """
+    Review counters of a user, read from the review_stats aggregate. Negative
+    and authored counts follow the caller's role like the review fields.
+    """
+
+    token_payload = await verify_token_async(request, "access_token")
+    user_id = token_payload.get("user_id")
+    role = token_payload.get("role", "colleague")
+
+    async with AsyncSessionLocal() as session:
+        stats = (
+            await session.execute(
+                select(User.id, *stats_columns())
+                .outerjoin(ReviewStats, ReviewStats.user_id == User.id)
+                .where(User.id == target_id)
+            )
+        ).one_or_none()
+        if not stats:
+            raise UserNotFoundError()
+
+        own = str(target_id) == str(user_id)
+        etag = make_etag("stats", role, own, *stats)
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+
+        response = jsonify(
+            {"user_id": str(target_id), **serialize_stats(stats, role, own=own)}
         )
+        return add_cache_headers(response, etag), 200
 
 
 @auth_bp.route("/api/auth/refresh", methods=["POST"])
@@ -187,7 +289,7 @@ def refresh():
             user = session.get(User, user_id)
             if not user:
                 raise UserNotFoundError()
-            revoke_refresh_token(jti, session)
+            revoke_refresh_token(jti, session, raw_token=token)
             return create_auth_response("Token refresh successful", user)
 
     except ExpiredTokenError:
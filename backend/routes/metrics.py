@@ -0,0 +1,34 @@
+import models.async_db
+import models.models
+from flask import Blueprint, Response
+from models.pool import pool_status
+from utils.metrics import format_gauges, request_metrics
+from utils.rate_limit import rate_limiter
+from utils.response_cache import review_feed_cache
+from utils.user_cache import user_cache
+
+metrics_bp = Blueprint("metrics_bp", __name__)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def metrics():
+    """Exposes request, cache and connection pool metrics in the Prometheus text format."""
+
+    lines = request_metrics.render()
+    lines += format_gauges("user_cache", "User existence cache.", user_cache.stats())
+    lines += format_gauges(
+        "review_feed_cache", "Serialized review feed cache.", review_feed_cache.stats()
+    )
+    lines += format_gauges("rate_limiter", "Auth rate limiter.", rate_limiter.stats())
+    if models.models.engine is not None:
+        lines += format_gauges(
+            "db_pool", "Sync engine connection pool.", pool_status(models.models.engine.pool)
+        )
+    # pooled only when served through asgi.py; the dev server uses NullPool
+    async_engine = models.async_db.async_engine
+    if async_engine is not None and hasattr(async_engine.pool, "stats"):
+        lines += format_gauges(
+            "db_async_pool", "Async engine connection pool.", pool_status(async_engine.pool)
+        )
+
+    return Response("\n".join(lines) + "\n", mimetype="text/plain; version=0.0.4")
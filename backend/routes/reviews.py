@@ -1,19 +1,43 @@
+import time
 import uuid
 
-from access.access import can_create_negative_review
-from access.serializers import serialize_review_for_role
+from access.access import can_create_negative_review, visible_fields
+from access.serializers import encode_review_rows, select_reviews_for_role
 from errors.api_errors import (
+    APIError,
     AtLeastOneNonEmptyError,
+    BatchTooLargeError,
+    InvalidFieldError,
+    InvalidQueryParamError,
     MaxLimitExceededError,
+    MissingFieldsError,
     PermissionsError,
     ReviewTargetNotFoundError,
     SelfReviewNotAllowedError,
+    TokenUserNotFoundError,
 )
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request, stream_with_context
+from models.async_db import AsyncSessionLocal
 from models.models import Review, Session, User
-from sqlalchemy import select
-from utils.auth_utils import verify_token
-from utils.general_utils import check_required_fields
+from sqlalchemy import Float, func, insert, literal_column, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from utils.auth_utils import verify_token, verify_token_async
+from utils.general_utils import (
+    check_required_fields,
+    parse_datetime_arg,
+    parse_uuid_arg,
+    violated_constraint,
+)
+from utils.http_cache import (
+    add_cache_headers,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+)
+from utils.json_provider import dumps_value
+from utils.pagination import encode_cursor, get_cursor, get_page_size
+from utils.response_cache import review_feed_cache
+from utils.review_stats import record_reviews
 
 # Initialize the Flask application
 reviews_bp = Blueprint("reviews_bp", __name__)
@@ -21,26 +45,26 @@ reviews_bp = Blueprint("reviews_bp", __name__)
 # maximum length for
 MAX_LEN = 1000
 
+# text search configuration the reviews.search_* columns are built with
+SEARCH_CONFIG = literal_column("'english'")
 
-@reviews_bp.route("/api/reviews", methods=["POST"])
-def create_review():
-    """Handles creating and retrieving reviews."""
-
-    token_payload = verify_token(request, "access_token")
-    user_id = token_payload.get("user_id")
-    role = token_payload.get("role", "colleague")
 
-    data = request.get_json()
+def validate_review_input(data, user_id, role):
+    """
+    Checks and normalizes one review payload.
+    Returns (recipient UUID, positive, negative) or raises the matching APIError.
+    """
 
     # check required fields
     required_fields = ["recipient_id", "positive"]
+    if not isinstance(data, dict):
+        raise MissingFieldsError(required_fields)
     check_required_fields(data, required_fields)
-    
+
     # input normalization
     positive = (data.get("positive") or "").strip()
     negative = (data.get("negative") or "")
     negative = negative.strip() if isinstance(negative, str) else ""
-    
 
     # any of positive or negative reviews should be filled
     if not (positive or negative):
@@ -53,56 +77,406 @@ def create_review():
     if negative and not can_create_negative_review(role):
         raise PermissionsError("You don't have permissions to create negative review")
 
+    # a malformed id cannot belong to any user
+    try:
+        recipient_id = uuid.UUID(str(data["recipient_id"]))
+    except ValueError:
+        raise ReviewTargetNotFoundError(data["recipient_id"])
+
     # check if user tries to create reviews about themselves
-    if user_id == data["recipient_id"]:
+    if str(recipient_id) == str(user_id):
         raise SelfReviewNotAllowedError()
 
+    return recipient_id, positive, negative
+
+
+@reviews_bp.route("/api/reviews", methods=["POST"])
+def create_review():
+    """Handles creating and retrieving reviews."""
+
+    token_payload = verify_token(request, "access_token")
+    user_id = token_payload.get("user_id")
+    role = token_payload.get("role", "colleague")
+
+    data = request.get_json()
+    recipient_id, positive, negative = validate_review_input(data, user_id, role)
+
+    # one INSERT ... RETURNING; the recipient is checked by the FK constraint
     with Session.begin() as session:
-        target_user = session.get(User, data["recipient_id"])
-        if not target_user:
-            raise ReviewTargetNotFoundError(data["recipient_id"])
-
-        new_review = Review(
-            id=str(uuid.uuid4()),
-            positive=positive,
-            negative=negative,
-            recipient_id=target_user.id,
-            author_id=user_id,
-        )
+        try:
+            new_review = session.execute(
+                insert(Review)
+                .values(
+                    id=uuid.uuid4(),
+                    positive=positive,
+                    negative=negative,
+                    recipient_id=recipient_id,
+                    author_id=user_id,
+                )
+                .returning(
+                    Review.id,
+                    Review.positive,
+                    Review.negative,
+                    Review.recipient_id,
+                    Review.author_id,
+                    Review.created_at,
+                )
+            ).one()
+        except IntegrityError as e:
+            raise review_insert_error(e, recipient_id)
+
+        record_reviews(session, [new_review])
+        response = jsonify(dict(new_review._mapping))
+
+    # committed; cached feed pages no longer match the table
+    review_feed_cache.invalidate()
+    return response, 201
+
+
+def review_insert_error(error, recipient_id):
+    """Maps a foreign key violation from a review INSERT to its API error."""
+    if violated_constraint(error) == "reviews_author_id_fkey":
+        return TokenUserNotFoundError()
+    return ReviewTargetNotFoundError(recipient_id)
+
+
+def batch_item_error(index, error):
+    """Reports a rejected batch item in the same shape as the error handler."""
+    return {"index": index, "error": {"code": error.error_code, "message": error.message}}
+
+
+@reviews_bp.route("/api/reviews/batch", methods=["POST"])
+def create_reviews_batch():
+    """
+    Creates many reviews in one transaction: {"reviews": [{...}, ...]}.
+    Every item is validated like POST /api/reviews, recipients are checked
+    with a single IN query and the valid items are written with one
+    multi-row INSERT ... RETURNING. Invalid items are reported by index with
+    the same error codes as the single-review endpoint.
+    """
+
+    token_payload = verify_token(request, "access_token")
+    user_id = token_payload.get("user_id")
+    role = token_payload.get("role", "colleague")
+
+    data = request.get_json()
+    check_required_fields(data, ["reviews"])
+
+    items = data["reviews"]
+    max_items = current_app.config["REVIEW_BATCH_MAX_ITEMS"]
+    if not isinstance(items, list) or not items:
+        raise InvalidFieldError("reviews", "expected a non-empty list")
+    if len(items) > max_items:
+        raise BatchTooLargeError(max_items)
+
+    errors = []
+    valid = []  # (index, recipient uuid, positive, negative)
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, *validate_review_input(item, user_id, role)))
+        except APIError as e:
+            errors.append(batch_item_error(index, e))
+
+    created = []
+    if valid:
+        with Session.begin() as session:
+            recipients = {r[1] for r in valid}
+            # FOR KEY SHARE keeps the recipients from being deleted before the insert
+            existing = set(
+                session.scalars(
+                    select(User.id)
+                    .where(User.id.in_(recipients))
+                    .with_for_update(key_share=True)
+                )
+            )
+
+            rows = []
+            for index, recipient_uuid, positive, negative in valid:
+                if recipient_uuid not in existing:
+                    e = ReviewTargetNotFoundError(str(recipient_uuid))
+                    errors.append(batch_item_error(index, e))
+                    continue
+                rows.append(
+                    {
+                        "id": uuid.uuid4(),
+                        "positive": positive,
+                        "negative": negative,
+                        "recipient_id": recipient_uuid,
+                        "author_id": user_id,
+                    }
+                )
+
+            if rows:
+                try:
+                    inserted = session.execute(
+                        insert(Review).returning(
+                            Review.id,
+                            Review.positive,
+                            Review.negative,
+                            Review.recipient_id,
+                            Review.author_id,
+                            Review.created_at,
+                            sort_by_parameter_order=True,
+                        ),
+                        rows,
+                    )
+                    created = [dict(row._mapping) for row in inserted]
+                except IntegrityError as e:
+                    raise review_insert_error(
+                        e, ", ".join(sorted({str(row["recipient_id"]) for row in rows}))
+                    )
+                record_reviews(session, created)
+
+    if created:
+        review_feed_cache.invalidate()
+
+    errors.sort(key=lambda error: error["index"])
+    return jsonify({"created": created, "errors": errors}), 201 if created else 400
 
-        session.add(new_review)
-        session.flush()
-        session.refresh(new_review, attribute_names=["created_at"])
-
-        return (
-            jsonify(
-                {
-                    "id": new_review.id,
-                    "positive": new_review.positive,
-                    "negative": new_review.negative,
-                    "recipient_id": new_review.recipient_id,
-                    "author_id": new_review.author_id,
-                    "created_at": (
-                        new_review.created_at if new_review.created_at else None
-                    ),
-                }
-            ),
-            201,
+
+def review_filters(args, role, user_id):
+    """
+    Builds WHERE clauses from the recipient_id, author_id, from and to query
+    parameters. Filtering by author is only allowed to roles that can see
+    authors, or for the caller's own reviews.
+    """
+    filters = []
+
+    recipient_id = parse_uuid_arg(args, "recipient_id")
+    if recipient_id is not None:
+        filters.append(Review.recipient_id == recipient_id)
+
+    author_id = parse_uuid_arg(args, "author_id")
+    if author_id is not None:
+        if "author_id" not in visible_fields(role) and str(author_id) != user_id:
+            raise PermissionsError("You don't have permissions to filter by author")
+        filters.append(Review.author_id == author_id)
+
+    created_from = parse_datetime_arg(args, "from")
+    if created_from is not None:
+        filters.append(Review.created_at >= created_from)
+
+    created_to = parse_datetime_arg(args, "to")
+    if created_to is not None:
+        filters.append(Review.created_at < created_to)
+
+    return filters
+
+
+async def review_page(role, filters):
+    """Returns one page of the role-projected review feed matching filters."""
+
+    limit = get_page_size(request.args)
+    cursor = get_cursor(request.args)
+
+    # only the columns visible to the role are selected
+    query = (
+        select_reviews_for_role(role)
+        .where(*filters)
+        .order_by(Review.created_at.desc(), Review.id.desc())
+        .limit(limit + 1)  # one extra row tells us whether a next page exists
+    )
+    if cursor is not None:
+        query = query.where(tuple_(Review.created_at, Review.id) < cursor)
+
+    # pages are shared by everyone with the same role
+    cache_key = await review_feed_cache.key_async(role, request.path, request.query_string)
+    cached = await review_feed_cache.get_async(cache_key)
+    if cached is not None:
+        etag, body = cached
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+        response = current_app.response_class(body, mimetype="application/json")
+        return add_cache_headers(response, etag), 200
+
+    started = time.perf_counter()
+
+    async with AsyncSessionLocal() as session:
+
+        # reviews are insert-only: the newest matching row (one index probe)
+        # plus the write generation identify the view without counting rows.
+        # Items carry user names, so renames (users.updated_at) count too.
+        newest = (
+            select(Review.created_at, Review.id)
+            .where(*filters)
+            .order_by(Review.created_at.desc(), Review.id.desc())
+            .limit(1)
+            .subquery()
+        )
+        version = (
+            await session.execute(
+                select(
+                    newest.c.created_at,
+                    newest.c.id,
+                    select(func.max(User.updated_at)).scalar_subquery(),
+                )
+            )
+        ).one_or_none()
+        etag = make_etag(
+            "reviews",
+            role,
+            request.path,
+            request.query_string,
+            await review_feed_cache.generation_async(),
+            *(version or ()),
         )
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+
+        reviews = (await session.execute(query)).all()
+
+        next_cursor = None
+        if len(reviews) > limit:
+            reviews = reviews[:limit]
+            next_cursor = encode_cursor(reviews[-1].created_at, reviews[-1].id)
+
+    # rows are encoded straight to JSON bytes, same format as jsonify
+    body = (
+        b'{"items":['
+        + b",".join(encode_review_rows(reviews, role))
+        + b'],"next_cursor":'
+        + dumps_value(next_cursor)
+        + b"}\n"
+    )
+    await review_feed_cache.set_async(cache_key, etag, body, time.perf_counter() - started)
+
+    response = current_app.response_class(body, mimetype="application/json")
+    return add_cache_headers(response, etag), 200
 
 
 @reviews_bp.route("/api/reviews", methods=["GET"])
-def list_reviews():
-    """Handles retrieving reviews."""
+async def list_reviews():
+    """
+    Handles retrieving reviews, newest first, one page at a time.
+    Pages are keyed by (created_at, id); pass `next_cursor` back as `cursor`.
+    Optional filters: recipient_id, author_id, from, to (ISO 8601).
+    """
+
+    token_payload = await verify_token_async(request, "access_token")
+    role = token_payload.get("role", "colleague")
+    user_id = token_payload.get("user_id")
+
+    filters = review_filters(request.args, role, user_id)
+    return await review_page(role, filters)
+
+
+@reviews_bp.route("/api/users/<uuid:recipient_id>/reviews", methods=["GET"])
+async def list_user_reviews(recipient_id):
+    """Handles retrieving the reviews a user has received, paginated like list_reviews."""
+
+    token_payload = await verify_token_async(request, "access_token")
+    role = token_payload.get("role", "colleague")
+    user_id = token_payload.get("user_id")
+
+    filters = review_filters(request.args, role, user_id)
+    filters.append(Review.recipient_id == recipient_id)
+    return await review_page(role, filters)
+
+
+@reviews_bp.route("/api/reviews/search", methods=["GET"])
+async def search_reviews():
+    """
+    Full-text search over review text, best matches first, one page at a time.
+    `q` takes web search syntax ("quoted phrase", or, -word). Roles that cannot
+    see negative text only match on positive text. Pages are keyed by
+    (rank, id); accepts the same filters as list_reviews.
+    """
+
+    token_payload = await verify_token_async(request, "access_token")
+    role = token_payload.get("role", "colleague")
+    user_id = token_payload.get("user_id")
+
+    search = (request.args.get("q") or "").strip()
+    if not search:
+        raise InvalidQueryParamError("q")
+
+    filters = review_filters(request.args, role, user_id)
+    limit = get_page_size(request.args)
+    cursor = get_cursor(request.args, parse_key=float)
+
+    # negative text is neither matched nor ranked unless the role may see it
+    if "negative" in visible_fields(role):
+        vector = Review.search_all
+    else:
+        vector = Review.search_positive
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, search)
+    rank = func.ts_rank(vector, ts_query, type_=Float)
+
+    query = (
+        select_reviews_for_role(role)
+        .add_columns(rank.label("rank"))
+        .where(vector.op("@@")(ts_query), *filters)
+        .order_by(rank.desc(), Review.id.desc())
+        .limit(limit + 1)  # one extra row tells us whether a next page exists
+    )
+    if cursor is not None:
+        query = query.where(tuple_(rank, Review.id) < cursor)
+
+    async with AsyncSessionLocal() as session:
+        reviews = (await session.execute(query)).all()
+
+    next_cursor = None
+    if len(reviews) > limit:
+        reviews = reviews[:limit]
+        next_cursor = encode_cursor(reviews[-1].rank, reviews[-1].id)
+
+    # rank is not a visible field, so it is left out of the items
+    body = (
+        b'{"items":['
+        + b",".join(encode_review_rows(reviews, role))
+        + b'],"next_cursor":'
+        + dumps_value(next_cursor)
+        + b"}\n"
+    )
+    return current_app.response_class(body, mimetype="application/json")
+
+
+@reviews_bp.route("/api/reviews/export", methods=["GET"])
+def export_reviews():
+    """
+    Streams every review visible to the caller's role, newest first, as NDJSON
+    (default) or as one chunked JSON array (`format=json`). Rows are read
+    through a server-side cursor in EXPORT_BATCH_SIZE batches, so memory use
+    does not grow with the table. Accepts the same filters as list_reviews.
+    """
 
     token_payload = verify_token(request, "access_token")
     role = token_payload.get("role", "colleague")
+    user_id = token_payload.get("user_id")
+
+    export_format = request.args.get("format", "ndjson")
+    if export_format not in ("ndjson", "json"):
+        raise InvalidQueryParamError("format")
+
+    filters = review_filters(request.args, role, user_id)
+    query = (
+        select_reviews_for_role(role)
+        .where(*filters)
+        .order_by(Review.created_at.desc(), Review.id.desc())
+        .execution_options(yield_per=current_app.config["EXPORT_BATCH_SIZE"])
+    )
 
-    with Session() as session:
+    def generate():
+        with Session() as session:
+            result = session.execute(query)
+            first = True
 
-        reviews = session.scalars(
-            select(Review).order_by(Review.created_at.desc())
-        ).all()
+            if export_format == "json":
+                yield b"["
+            for batch in result.partitions():
+                rows = encode_review_rows(batch, role)
+                if export_format == "ndjson":
+                    yield b"".join(row + b"\n" for row in rows)
+                else:
+                    chunk = b",".join(rows)
+                    yield chunk if first else b"," + chunk
+                    first = False
+            if export_format == "json":
+                yield b"]\n"
 
-        reviews_data = [serialize_review_for_role(review, role) for review in reviews]
-        return jsonify(reviews_data), 200
+    mimetype = "application/x-ndjson" if export_format == "ndjson" else "application/json"
+    response = current_app.response_class(stream_with_context(generate()), mimetype=mimetype)
+    response.headers["Content-Disposition"] = (
+        f"attachment; filename=reviews.{export_format}"
+    )
+    return response
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask, jsonify, request
+
+import asgi
+from asgi import FlaskAsgi, build_environ
+
+
+def http_scope(method, path, query_string=b"", headers=()):
+    return {
+        "type": "http",
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "root_path": "",
+        "query_string": query_string,
+        "headers": list(headers),
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+
+
+async def call(app, method, path, body=b"", headers=()):
+    """Runs one request through `app`, returning (status, headers, body)."""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await app(http_scope(method, path, headers=headers), receive, send)
+    start = sent[0]
+    assert start["type"] == "http.response.start"
+    assert not sent[-1].get("more_body")
+    return (
+        start["status"],
+        {name.decode(): value.decode() for name, value in start["headers"]},
+        b"".join(message.get("body", b"") for message in sent[1:]),
+    )
+
+
+def request_once(app, method, path, body=b"", headers=()):
+    return asyncio.run(call(app, method, path, body, headers))
+
+
+def test_async_view_runs_flask_error_handlers():
+    environ = build_environ(http_scope("GET", "/api/reviews"), None)
+    assert asgi.asgi_app.is_async_view(environ)
+
+    status, headers, body = request_once(asgi.asgi_app, "GET", "/api/reviews")
+    assert status == 401
+    assert headers["content-type"] == "application/json"
+    assert "error" in json.loads(body)
+
+
+def test_sync_view_runs_on_the_executor():
+    status, _, body = request_once(
+        asgi.asgi_app,
+        "POST",
+        "/api/auth/login",
+        body=b"{}",
+        headers=[(b"content-type", b"application/json")],
+    )
+    assert status == 400
+    assert "error" in json.loads(body)
+
+
+def test_cors_preflight():
+    status, headers, _ = request_once(
+        asgi.asgi_app,
+        "OPTIONS",
+        "/api/reviews",
+        headers=[
+            (b"origin", b"http://localhost:5173"),
+            (b"access-control-request-method", b"GET"),
+        ],
+    )
+    assert status == 200
+    assert headers["access-control-allow-origin"] == "http://localhost:5173"
+    assert headers["access-control-allow-credentials"] == "true"
+
+
+def test_unknown_path():
+    status, _, _ = request_once(asgi.asgi_app, "GET", "/api/does-not-exist")
+    assert status == 404
+
+
+def test_lifespan():
+    server = FlaskAsgi(Flask(__name__), ThreadPoolExecutor(max_workers=1))
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message["type"])
+
+    asyncio.run(server({"type": "lifespan"}, receive, send))
+    assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+
+
+def test_async_views_do_not_hold_executor_threads():
+    app = Flask(__name__)
+
+    @app.route("/slow")
+    async def slow():
+        await asyncio.sleep(0.2)
+        return jsonify(ok=True)
+
+    server = FlaskAsgi(app, ThreadPoolExecutor(max_workers=1))
+
+    async def run_all():
+        return await asyncio.gather(*(call(server, "GET", "/slow") for _ in range(20)))
+
+    started = time.perf_counter()
+    responses = asyncio.run(run_all())
+    assert time.perf_counter() - started < 2
+    assert all(status == 200 for status, _, _ in responses)
+
+
+def test_wsgi_middleware_sees_async_views():
+    app = Flask(__name__)
+
+    @app.route("/remote")
+    async def remote():
+        return jsonify(remote_addr=request.remote_addr)
+
+    wrapped = app.wsgi_app
+
+    def middleware(environ, start_response):
+        environ["REMOTE_ADDR"] = "203.0.113.7"
+        return wrapped(environ, start_response)
+
+    app.wsgi_app = middleware
+    server = FlaskAsgi(app, ThreadPoolExecutor(max_workers=1))
+
+    status, _, body = request_once(server, "GET", "/remote")
+    assert status == 200
+    assert json.loads(body) == {"remote_addr": "203.0.113.7"}
@@ -0,0 +1,27 @@
+from flask import Flask, request
+
+from utils.response_cache import ReviewFeedCache
+
+PATHS = ["/api/reviews", "/api/users/A/reviews", "/api/users/B/reviews"]
+
+
+def feed_key(cache, path, query_string="limit=50"):
+    with Flask(__name__).test_request_context(f"{path}?{query_string}"):
+        return cache.key("colleague", request.path, request.query_string)
+
+
+def test_routes_with_the_same_query_string_do_not_share_entries():
+    cache = ReviewFeedCache()
+    keys = {feed_key(cache, path) for path in PATHS}
+    assert len(keys) == len(PATHS)
+
+    cache.set(feed_key(cache, "/api/reviews"), "etag", b"global feed", 0.0)
+    assert cache.get(feed_key(cache, "/api/reviews")) == ("etag", b"global feed")
+    assert cache.get(feed_key(cache, "/api/users/A/reviews")) is None
+
+
+def test_invalidate_changes_every_key():
+    cache = ReviewFeedCache()
+    before = feed_key(cache, "/api/reviews")
+    cache.invalidate()
+    assert feed_key(cache, "/api/reviews") != before
@@ -0,0 +1,61 @@
+import json
+import uuid
+from collections import namedtuple
+from datetime import datetime
+
+import pytest
+from flask import Flask, jsonify
+
+from access.access import Role, visible_fields
+from access.serializers import KEYSET_FIELDS, REVIEW_COLUMNS, encode_review_rows
+from utils.json_provider import init_json_provider
+
+
+def review_rows(role):
+    """Rows shaped like select_reviews_for_role(role) returns them."""
+    fields = [name for name in REVIEW_COLUMNS if name in visible_fields(role) | KEYSET_FIELDS]
+    Row = namedtuple("Row", fields)
+    values = {
+        "id": uuid.uuid4(),
+        "created_at": datetime(2026, 10, 18, 9, 30, 15, 123456),
+        "recipient_id": uuid.uuid4(),
+        "recipient_name": "Zoë Łukasiewicz",
+        "author_id": uuid.uuid4(),
+        "author_name": "Ivan \"Vanya\" Petrov",
+        "positive": "Helpful 👍, привет\nnew line",
+        "negative": None,
+    }
+    return [
+        Row(**{name: values[name] for name in fields}),
+        Row(**{name: uuid.uuid4() if name.endswith("id") else values[name] for name in fields}),
+    ]
+
+
+def make_app(provider, debug):
+    app = Flask(__name__)
+    app.debug = debug
+    if provider == "orjson":
+        pytest.importorskip("orjson")
+        init_json_provider(app)
+    return app
+
+
+@pytest.mark.parametrize("provider", ["default", "orjson"])
+@pytest.mark.parametrize("debug", [False, True])
+@pytest.mark.parametrize("role", list(Role))
+def test_encode_review_rows_matches_jsonify(role, provider, debug):
+    app = make_app(provider, debug)
+    rows = review_rows(role)
+    allowed = visible_fields(role)
+
+    with app.app_context():
+        expected = jsonify(
+            [{k: v for k, v in row._asdict().items() if k in allowed} for row in rows]
+        ).get_data()
+    encoded = b"[" + b",".join(encode_review_rows(rows, role)) + b"]"
+
+    assert json.loads(encoded) == json.loads(expected)
+    # same keys in the same (sorted) order as jsonify
+    assert [list(item) for item in json.loads(encoded)] == [
+        list(item) for item in json.loads(expected)
+    ]
@@ -5,9 +5,11 @@ from datetime import datetime, timezone, timedelta
 
 from flask import current_app
 from flask import jsonify, make_response
-from sqlalchemy import select, func
+from sqlalchemy import case, func, insert, or_, select, update
 
+from models.async_db import AsyncSessionLocal
 from models.models import RefreshToken, User, Session
+from utils.user_cache import user_cache
 from errors.api_errors import (
     MissingTokenError,
     ExpiredTokenError,
@@ -44,8 +46,8 @@ def decode_token(token, verify_exp=True):
     )
 
 
-def verify_token(request, token_name):
-    """Validates JWT token from cookie"""
+def _decode_request_token(request, token_name):
+    """Reads a JWT token from the request cookie and decodes it."""
 
     token = request.cookies.get(token_name)
 
@@ -53,37 +55,63 @@ def verify_token(request, token_name):
         raise MissingTokenError(token_name)
 
     try:
-        decoded = decode_token(token)
-
-        user_id = decoded.get("user_id")
-        with Session() as session:
-            # check if email exists in database
-            user = session.query(User).filter_by(id=user_id).first()
-            if not user:
-                raise TokenUserNotFoundError()
-
-            return decoded
-
+        return decode_token(token)
     except jwt.ExpiredSignatureError:
         raise ExpiredTokenError(token_name)
     except jwt.InvalidTokenError:
         raise InvalidTokenError(token_name)
 
 
-def create_token(response, token_name, expiry, user_info):
-    """Creates a JWT token and sets it in the response cookie."""
-    expiration_date = datetime.now(timezone.utc) + timedelta(seconds=expiry)
-    jti = str(uuid.uuid4())
+def verify_token(request, token_name):
+    """Validates JWT token from cookie"""
 
-    new_token = jwt.encode(
-        {
-            "jti": jti,
-            "user_id": str(user_info.id),
-            "role": user_info.role,
-            "exp": expiration_date,
-        },
-        current_app.config["SECRET_KEY"],
-        algorithm="HS256",
+    decoded = _decode_request_token(request, token_name)
+    user_id = decoded.get("user_id")
+
+    # users seen recently are trusted without a database round trip
+    if user_cache.contains(user_id):
+        return decoded
+
+    with Session() as session:
+        # check if user exists in database
+        exists = session.execute(
+            select(User.id).where(User.id == user_id)
+        ).scalar_one_or_none()
+        if not exists:
+            raise TokenUserNotFoundError()
+
+    user_cache.add(user_id)
+    return decoded
+
+
+async def verify_token_async(request, token_name):
+    """Validates JWT token from cookie, checking the user through AsyncSessionLocal"""
+
+    decoded = _decode_request_token(request, token_name)
+    user_id = decoded.get("user_id")
+
+    if user_cache.contains(user_id):
+        return decoded
+
+    async with AsyncSessionLocal() as session:
+        exists = (
+            await session.execute(select(User.id).where(User.id == user_id))
+        ).scalar_one_or_none()
+        if not exists:
+            raise TokenUserNotFoundError()
+
+    user_cache.add(user_id)
+    return decoded
+
+
+def create_token(response, token_name, expiry, user_info, session=None, login=False):
+    """
+    Creates a JWT token and sets it in the response cookie.
+    Refresh tokens are stored through `session` when one is given (the caller
+    commits), otherwise in a transaction of their own.
+    """
+    new_token, jti, expiration_date = generate_jwt(
+        str(user_info.id), user_info.role, expiry
     )
 
     response.set_cookie(
@@ -96,13 +124,13 @@ def create_token(response, token_name, expiry, user_info):
 
     if token_name == "refresh_token":
         try:
-            with Session() as session:
-                new_refresh_token = RefreshToken(
-                    id=jti, user_id=str(user_info.id), expires_at=expiration_date
-                )
-                new_refresh_token.set_token(new_token)
-                session.add(new_refresh_token)
-                session.commit()
+            if session is not None:
+                store_refresh_token(session, user_info.id, new_token, jti, expiration_date, login)
+            else:
+                with Session.begin() as own_session:
+                    store_refresh_token(
+                        own_session, user_info.id, new_token, jti, expiration_date, login
+                    )
         except Exception as e:
             current_app.logger.error(f"Database error: {str(e)}")
             raise DatabaseError("Error processing review data")
@@ -110,12 +138,49 @@ def create_token(response, token_name, expiry, user_info):
     return response
 
 
-def revoke_refresh_token(jti, session):
-    """Revokes a refresh token by marking it as revoked in the database."""
-    token = session.query(RefreshToken).filter_by(id=jti).first()
+def store_refresh_token(session, user_id, token, jti, expires_at, login=False):
+    """
+    Inserts a refresh token row. With login=True the same statement also
+    revokes the user's other active tokens and resets their failed login
+    attempts, so a successful login is written in one round trip.
+    """
+    statement = insert(RefreshToken).values(
+        id=uuid.UUID(jti),
+        user_id=user_id,
+        token_hash=RefreshToken.digest(token),
+        expires_at=expires_at,
+    )
+
+    if login:
+        revoked = (
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.is_revoked.is_(False))
+            .values(is_revoked=True)
+            .cte("revoked_tokens")
+        )
+        reset = (
+            update(User)
+            .where(User.id == user_id, User.failed_login_attempts != 0)
+            # login bookkeeping is not a profile change (see record_failed_login)
+            .values(failed_login_attempts=0, updated_at=User.updated_at)
+            .cte("reset_attempts")
+        )
+        statement = statement.add_cte(revoked, reset)
+
+    session.execute(statement)
+
+
+def revoke_refresh_token(jti, session, raw_token=None):
+    """
+    Revokes a refresh token by marking it as revoked in the database.
+    If raw_token is given, it must match the stored digest.
+    """
+    token = session.get(RefreshToken, jti)
 
     if not token:
         raise TokenNotFoundError
+    if raw_token is not None and not token.check_token(raw_token):
+        raise TokenNotFoundError
     if token.is_revoked:
         raise TokenRevokedError
 
@@ -132,21 +197,38 @@ def validate_email_format(email):
         raise InvalidEmailFormat()
 
 
-def check_user_locked(session, user):
-    if not user.lock_login_until:
-        return None
-
-    db_now = session.execute(select(func.now())).scalar_one()  # get DB time
-    if user.lock_login_until > db_now:
-        return int((user.lock_login_until - db_now).total_seconds())
-    return None
-
-
-def revoke_user_refresh_tokens(session, user_id):
-    """Revoke all active refresh tokens"""
-    session.query(RefreshToken).filter(
-        RefreshToken.user_id == user_id, RefreshToken.is_revoked.is_(False)
-    ).update({RefreshToken.is_revoked: True}, synchronize_session=False)
+def record_failed_login(session, user_id):
+    """
+    Counts a failed login with a single UPDATE ... RETURNING. When the count
+    reaches LOCKOUT_ATTEMPTS it is reset and the account is locked for
+    LOCKOUT_DURATION_SECONDS from the database clock.
+    Returns the lock expiry, or None if the account is not locked.
+    """
+    limit = current_app.config["LOCKOUT_ATTEMPTS"]
+    duration = timedelta(seconds=current_app.config["LOCKOUT_DURATION_SECONDS"])
+    reaches_limit = User.failed_login_attempts + 1 >= limit
+
+    return session.execute(
+        update(User)
+        # attempts made while a concurrent request locked the account are not counted
+        .where(
+            User.id == user_id,
+            or_(User.lock_login_until.is_(None), User.lock_login_until <= func.now()),
+        )
+        .values(
+            failed_login_attempts=case(
+                (reaches_limit, 0), else_=User.failed_login_attempts + 1
+            ),
+            lock_login_until=case(
+                (reaches_limit, func.now() + duration), else_=User.lock_login_until
+            ),
+            # keep the updated_at onupdate from firing: max(updated_at) versions
+            # the feed and directory ETags, which lockouts must not invalidate
+            updated_at=User.updated_at,
+        )
+        .returning(User.lock_login_until)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
 
 
 def create_auth_response(user, message):
@@ -170,11 +252,12 @@ def create_auth_response(user, message):
     return response
 
 
-def create_auth_response(message, user=None, logout=False):
+def create_auth_response(message, user=None, logout=False, session=None, login=False):
     """
     Response:
     - if logout=True (or user is None), clear cookies
-    - else return access_token and refresh_token
+    - else return access_token and refresh_token; see create_token for
+      `session` and store_refresh_token for `login`
     """
     response = make_response(jsonify({"message": message}))
 
@@ -197,5 +280,7 @@ def create_auth_response(message, user=None, logout=False):
         token_name="refresh_token",
         expiry=current_app.config["REFRESH_TOKEN_EXPIRES_SECONDS"],
         user_info=user,
+        session=session,
+        login=login,
     )
     return response
@@ -0,0 +1,36 @@
+import csv
+import io
+
+
+# unquoted marker for NULL, so that empty strings stay empty strings
+NULL = "\\N"
+
+
+def rows_to_csv(rows):
+    """Writes rows (sequences of values, None for NULL) to an in-memory CSV buffer."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        [NULL if value is None else value for value in row] for row in rows
+    )
+    buffer.seek(0)
+    return buffer
+
+
+def copy_csv(connection, table, columns, buffer):
+    """
+    Loads a buffer from rows_to_csv into `table` with COPY ... FROM STDIN
+    through the DBAPI connection behind a SQLAlchemy Connection.
+    Works with psycopg2 and psycopg 3.
+    """
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '{NULL}')"
+    cursor = connection.connection.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            cursor.copy_expert(sql, buffer)
+        else:  # psycopg 3
+            with cursor.copy(sql) as copy:
+                while data := buffer.read(1 << 16):
+                    copy.write(data)
+    finally:
+        cursor.close()
@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+
+from werkzeug.utils import import_string
+
+
+class CacheBackend:
+    """
+    Interface for key/value stores used by the in-process caches.
+    A shared store (Redis, memcached...) can be plugged in by implementing
+    these methods and pointing the matching *_BACKEND config value at it;
+    such classes are constructed with the app config.
+    Set `blocking = False` only for stores that never wait on I/O; calls to
+    blocking stores are moved off the event loop by async callers.
+    """
+
+    blocking = True
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def incr(self, key, amount=1, ttl=None):
+        """Atomically adds amount to an integer value (0 if missing) and returns it."""
+        raise NotImplementedError
+
+
+class InMemoryBackend(CacheBackend):
+    """Thread-safe LRU store with optional per-key TTL, local to the process."""
+
+    blocking = False
+
+    def __init__(self, max_size=1000):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_entry(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _set_entry(self, key, value, ttl, now):
+        self._entries[key] = (value, now + ttl if ttl else None)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._get_entry(key, time.monotonic())
+            return None if entry is None else entry[0]
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._set_entry(key, value, ttl, time.monotonic())
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def incr(self, key, amount=1, ttl=None):
+        with self._lock:
+            now = time.monotonic()
+            entry = self._get_entry(key, now)
+            if entry is None:
+                value, expires_at = amount, (now + ttl if ttl else None)
+            else:
+                value, expires_at = entry[0] + amount, entry[1]
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            return value
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def create_backend(config, prefix):
+    """
+    Instantiates the backend class named by config[f"{prefix}_BACKEND"].
+    Shared backends are constructed with the app config to read their settings.
+    """
+    backend_class = import_string(config[f"{prefix}_BACKEND"])
+    if backend_class is InMemoryBackend:
+        return backend_class(max_size=config[f"{prefix}_MAX_SIZE"])
+    return backend_class(config)
@@ -0,0 +1,221 @@
+import hashlib
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from access.access import Role
+from utils.bulk_copy import copy_csv, rows_to_csv
+
+FIRST_NAMES = [
+    "Anna", "Boris", "Chen", "Daria", "Elena", "Farid", "Grace", "Hiro", "Ivan", "Julia",
+    "Kofi", "Lena", "Maria", "Nikolai", "Olga", "Pavel", "Quinn", "Rosa", "Sergey", "Tanya",
+    "Umar", "Vera", "Wei", "Xenia", "Yusuf", "Zoe",
+]
+LAST_NAMES = [
+    "Ivanova", "Smith", "Garcia", "Kim", "Petrov", "Nguyen", "Muller", "Rossi", "Sato",
+    "Kowalski", "Haddad", "Silva", "Novak", "Larsen", "Okafor", "Lebedeva", "Chen", "Brown",
+]
+WORDS = (
+    "helpful reliable thorough kind proactive mentor shipped fixed reviewed explained "
+    "calm focused patient ownership deadline quality communication design testing "
+    "feedback initiative support clear code team customer incident docs"
+).split()
+
+# every Nth user (by index) gets a privileged role; the rest are colleagues
+ROLE_EVERY = {Role.super_rat: 33, Role.rat: 8}
+
+# share of reviews with a negative part (only privileged authors write them)
+NEGATIVE_SHARE = 0.35
+
+# share of generated refresh tokens that are revoked / already expired
+REVOKED_SHARE = 0.3
+EXPIRED_SHARE = 0.4
+
+REVIEW_MAX_LEN = 1000
+
+
+def user_id(run_id, index):
+    """Deterministic id of the index-th generated user, so chunks need no lookups."""
+    return uuid.UUID(int=(run_id << 64) | index, version=4)
+
+
+def random_id(rng):
+    """A version-4 UUID drawn from rng, so a seeded run repeats its ids."""
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def user_role(index):
+    for role, every in ROLE_EVERY.items():
+        if index % every == 0:
+            return role.value
+    return Role.colleague.value
+
+
+def review_text(rng):
+    """Review text whose length follows a long-tailed (log-normal) distribution."""
+    words = max(1, min(int(rng.lognormvariate(2.5, 0.8)), 150))
+    return " ".join(rng.choice(WORDS) for _ in range(words))[:REVIEW_MAX_LEN].capitalize()
+
+
+def user_rows(run_id, start, count, password_hash, now, days, seed):
+    rng = random.Random(seed)
+    for index in range(start, start + count):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        created_at = now - timedelta(seconds=rng.randint(0, days * 86400))
+        yield (
+            user_id(run_id, index),
+            f"{name.replace(' ', '.').lower()}.{run_id:x}.{index}@example.test",
+            name,
+            password_hash,
+            user_role(index),
+            created_at,
+            created_at,
+            0,
+        )
+
+
+def review_rows(run_id, users, start, count, now, days, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        author = rng.randrange(users)
+        # any other user; the shift keeps the pick uniform while skipping the author
+        recipient = rng.randrange(users - 1)
+        recipient += recipient >= author
+
+        negative = ""
+        if user_role(author) != Role.colleague.value and rng.random() < NEGATIVE_SHARE:
+            negative = review_text(rng)
+
+        yield (
+            random_id(rng),
+            review_text(rng),
+            negative,
+            user_id(run_id, recipient),
+            user_id(run_id, author),
+            now - timedelta(seconds=rng.randint(0, days * 86400)),
+        )
+
+
+def token_rows(run_id, users, start, count, now, days, refresh_seconds, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        if rng.random() < EXPIRED_SHARE:
+            expires_at = now - timedelta(seconds=rng.randint(1, days * 86400))
+        else:
+            expires_at = now + timedelta(seconds=rng.randint(1, refresh_seconds))
+        yield (
+            random_id(rng),
+            user_id(run_id, rng.randrange(users)),
+            hashlib.sha256(rng.getrandbits(256).to_bytes(32, "big")).hexdigest(),
+            expires_at,
+            rng.random() < REVOKED_SHARE,
+        )
+
+
+TABLES = {
+    "users": (
+        ["id", "email", "name", "password_hash", "role", "created_at", "updated_at",
+         "failed_login_attempts"],
+        user_rows,
+    ),
+    "reviews": (
+        ["id", "positive", "negative", "recipient_id", "author_id", "created_at"],
+        review_rows,
+    ),
+    "refresh_token": (
+        ["id", "user_id", "token_hash", "expires_at", "is_revoked"],
+        token_rows,
+    ),
+}
+
+
+def load_chunk(database_url, table, args):
+    """Generates one chunk of rows and COPYs it in its own transaction (runs in a worker process)."""
+    columns, generate = TABLES[table]
+    buffer = rows_to_csv(generate(*args))
+
+    engine = create_engine(database_url, poolclass=NullPool)
+    try:
+        with engine.begin() as connection:
+            copy_csv(connection, table, columns, buffer)
+    finally:
+        engine.dispose()
+
+
+def generate_data(
+    database_url,
+    users,
+    reviews,
+    tokens,
+    password_hash,
+    workers,
+    chunk_size,
+    days=730,
+    refresh_seconds=86400,
+    seed=None,
+    progress=None,
+):
+    """
+    Bulk-loads synthetic users, reviews and refresh tokens with COPY, in
+    chunks spread over `workers` processes. Users are loaded first so the
+    reviews and tokens that reference them satisfy the foreign keys. Every
+    unseeded run uses fresh ids and emails, so it adds to existing data; a
+    given `seed` reproduces the same ids, emails and text (timestamps stay
+    relative to now), so reload it into an emptied database.
+    Returns {table: (rows, seconds)}.
+    """
+    if reviews and users < 2:
+        raise ValueError("reviews need at least two users")
+    if tokens and users < 1:
+        raise ValueError("refresh tokens need at least one user")
+
+    rng = random.Random(seed)
+    run_id = rng.getrandbits(64)
+    now = datetime.now(timezone.utc)
+    report = {}
+
+    # table -> arguments of its row generator for a (start, count, seed) chunk
+    plan = {
+        "users": (users, lambda *chunk: (run_id, *chunk[:2], password_hash, now, days, chunk[2])),
+        "reviews": (reviews, lambda *chunk: (run_id, users, *chunk[:2], now, days, chunk[2])),
+        "refresh_token": (
+            tokens,
+            lambda *chunk: (run_id, users, *chunk[:2], now, days, refresh_seconds, chunk[2]),
+        ),
+    }
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for table, (total, chunk_args) in plan.items():
+            if not total:
+                continue
+            started = time.perf_counter()
+            futures = [
+                pool.submit(
+                    load_chunk,
+                    database_url,
+                    table,
+                    chunk_args(start, min(chunk_size, total - start), rng.getrandbits(64)),
+                )
+                for start in range(0, total, chunk_size)
+            ]
+            # a table is complete before the next one, whose rows reference it, starts
+            for done, future in enumerate(futures, 1):
+                future.result()
+                if progress:
+                    progress(table, min(done * chunk_size, total), total)
+            report[table] = (total, time.perf_counter() - started)
+
+    engine = create_engine(database_url, poolclass=NullPool)
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("ANALYZE users, reviews, refresh_token"))
+            connection.commit()
+    finally:
+        engine.dispose()
+
+    return report
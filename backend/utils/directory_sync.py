@@ -0,0 +1,176 @@
+import csv
+import json
+import re
+import secrets
+import time
+
+from sqlalchemy import ARRAY, String, any_, bindparam, select, text
+
+from access.access import Role
+from models.models import Session, User
+from utils.bulk_copy import copy_csv, rows_to_csv
+from utils.hashing import password_hasher
+from utils.response_cache import review_feed_cache
+
+EMAIL_PATTERN = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+EMAIL_MAX_LEN = 120
+NAME_MAX_LEN = 256
+ROLES = {role.value for role in Role}
+
+STAGING_COLUMNS = ["email", "name", "role", "password_hash"]
+
+
+def read_employees(path, file_format=None):
+    """
+    Reads employee records (dicts) from a CSV file with a header row or from
+    NDJSON (one JSON object per line). The format defaults to the file extension.
+    """
+    file_format = file_format or ("ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv")
+
+    with open(path, newline="", encoding="utf-8") as f:
+        if file_format == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def normalize_employees(records):
+    """
+    Validates and normalizes employee records. Returns (employees, skipped,
+    has_roles): employees by email (the last record for an email wins),
+    skipped reasons with their counts, and whether any record carried a role.
+    """
+    employees = {}
+    skipped = {}
+    has_roles = False
+
+    def skip(reason):
+        skipped[reason] = skipped.get(reason, 0) + 1
+
+    for record in records:
+        if not isinstance(record, dict):
+            skip("invalid record")
+            continue
+
+        email = str(record.get("email") or "").strip().lower()
+        name = str(record.get("name") or "").strip()
+        role = str(record.get("role") or "").strip()
+        password = record.get("password") or None
+
+        if not EMAIL_PATTERN.match(email) or len(email) > EMAIL_MAX_LEN:
+            skip("invalid email")
+        elif not name or len(name) > NAME_MAX_LEN:
+            skip("invalid name")
+        elif role and role not in ROLES:
+            skip("invalid role")
+        else:
+            if email in employees:
+                skip("duplicate email")
+            has_roles = has_roles or bool(role)
+            employees[email] = {"name": name, "role": role or None, "password": password}
+
+    return employees, skipped, has_roles
+
+
+def existing_emails(session, emails):
+    return set(
+        session.scalars(
+            select(User.email).where(
+                User.email == any_(bindparam("emails", list(emails), type_=ARRAY(String)))
+            )
+        )
+    )
+
+
+def sync_employees(records, update_roles=None, workers=None):
+    """
+    Upserts employees into users: the batch is staged with COPY into a temp
+    table and merged with one INSERT ... ON CONFLICT (email) DO UPDATE.
+    New users get the record's password, or a generated one, hashed on a
+    process pool; existing users keep their credentials and only get name
+    (and role, when the input has roles or update_roles is set) updates.
+    A record without a role never changes an existing user's role.
+    Returns counts of inserted, updated, unchanged and skipped records and
+    the generated initial passwords by email.
+    """
+    start = time.perf_counter()
+    employees, skipped, has_roles = normalize_employees(records)
+    update_roles = has_roles if update_roles is None else update_roles
+
+    # only new users need a password hash; hash them before the write
+    # transaction so it is not held open for the duration of the KDF
+    with Session() as session:
+        known = existing_emails(session, employees) if employees else set()
+    new_emails = [email for email in employees if email not in known]
+
+    generated = {}
+    passwords = []
+    for email in new_emails:
+        password = employees[email]["password"]
+        if password is None:
+            password = generated[email] = secrets.token_urlsafe(12)
+        passwords.append(password)
+    hashes = dict(zip(new_emails, password_hasher.hash_many(passwords, workers)))
+
+    rows = (
+        (email, employee["name"], employee["role"], hashes.get(email))
+        for email, employee in employees.items()
+    )
+
+    # EXCLUDED.role already holds the default for new users, so existing users
+    # take the staged role only when their record has one
+    staged_role = "(SELECT role FROM employee_import WHERE email = EXCLUDED.email)"
+    new_role = f"COALESCE({staged_role}, users.role)"
+    set_role = f"role = {new_role}," if update_roles else ""
+    changed_role = f"OR users.role IS DISTINCT FROM {new_role}" if update_roles else ""
+
+    with Session.begin() as session:
+        session.execute(
+            text(
+                "CREATE TEMP TABLE employee_import ("
+                " email varchar(120) PRIMARY KEY,"
+                " name varchar(256) NOT NULL,"
+                " role varchar(20),"
+                " password_hash varchar(256)"
+                ") ON COMMIT DROP"
+            )
+        )
+        copy_csv(session.connection(), "employee_import", STAGING_COLUMNS, rows_to_csv(rows))
+
+        # rows without a hash were existing users; one deleted since the check
+        # above is left out rather than inserted without credentials.
+        # xmax is 0 only for freshly inserted rows.
+        results = session.execute(
+            text(
+                "INSERT INTO users"
+                " (email, name, role, password_hash, created_at, updated_at, failed_login_attempts)"
+                " SELECT email, name, COALESCE(role, :default_role), password_hash,"
+                " now() AT TIME ZONE 'utc', now() AT TIME ZONE 'utc', 0"
+                " FROM employee_import"
+                " WHERE password_hash IS NOT NULL OR email IN (SELECT email FROM users)"
+                " ON CONFLICT (email) DO UPDATE SET"
+                f" name = EXCLUDED.name, {set_role}"
+                " updated_at = now() AT TIME ZONE 'utc'"
+                f" WHERE users.name IS DISTINCT FROM EXCLUDED.name {changed_role}"
+                " RETURNING (xmax = 0) AS inserted"
+            ),
+            {"default_role": Role.colleague.value},
+        ).scalars().all()
+
+    inserted = sum(1 for is_insert in results if is_insert)
+    updated = len(results) - inserted
+    if updated:
+        # cached feed pages carry recipient names (reaches other processes
+        # only through a shared FEED_CACHE_BACKEND)
+        review_feed_cache.invalidate()
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": len(employees) - inserted - updated,
+        "skipped": sum(skipped.values()),
+        "skipped_reasons": skipped,
+        "generated_passwords": generated,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
@@ -1,4 +1,7 @@
-from errors.api_errors import MissingFieldsError
+import uuid
+from datetime import datetime, timezone
+
+from errors.api_errors import InvalidQueryParamError, MissingFieldsError
 
 
 def check_required_fields(data, required_fields):
@@ -8,3 +11,45 @@ def check_required_fields(data, required_fields):
 
     if missing_fields:
         raise MissingFieldsError(missing_fields)
+
+
+def parse_uuid_arg(args, name):
+    """Returns the query parameter `name` as a UUID, or None if it is absent."""
+    value = args.get(name)
+    if not value:
+        return None
+
+    try:
+        return uuid.UUID(value)
+    except ValueError:
+        raise InvalidQueryParamError(name)
+
+
+def parse_datetime_arg(args, name):
+    """
+    Returns the ISO 8601 query parameter `name` as a naive UTC datetime
+    (the form timestamps are stored in), or None if it is absent.
+    """
+    value = args.get(name)
+    if not value:
+        return None
+
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise InvalidQueryParamError(name)
+
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def escape_like(value):
+    """Escapes LIKE wildcards so user input only ever matches literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def violated_constraint(error):
+    """Returns the constraint name behind an IntegrityError, if the driver reports it."""
+    diag = getattr(error.orig, "diag", None)
+    return getattr(diag, "constraint_name", None)
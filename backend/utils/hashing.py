@@ -0,0 +1,106 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from itertools import repeat
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from errors.api_errors import ServiceBusyError
+
+
+def _hash_password(password, method):
+    return generate_password_hash(password, method=method)
+
+
+def _check_password(password_hash, password):
+    return check_password_hash(password_hash, password)
+
+
+class PasswordHasher:
+    """
+    Runs password hashing on a bounded worker pool.
+    At most `workers + max_queue` jobs are admitted at once; anything beyond
+    that is rejected straight away with ServiceBusyError (503) instead of
+    piling up behind the KDF.
+    """
+
+    def __init__(self):
+        self.method = "scrypt"
+        self.timeout = 10
+        self._executor_type = "thread"
+        self._workers = 1
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(1)
+        self._lock = threading.Lock()
+
+    def configure(self, method, executor, workers, max_queue, timeout):
+        """Applies hashing parameters and pool sizing from the app config."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            self.method = method
+            self.timeout = timeout
+            self._executor_type = executor
+            self._workers = max(1, workers)
+            self._slots = threading.BoundedSemaphore(self._workers + max(0, max_queue))
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                if self._executor_type == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self._workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._workers, thread_name_prefix="password-hash"
+                    )
+            return self._executor
+
+    def _run(self, fn, *args):
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise ServiceBusyError()
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            slots.release()
+            raise
+        # the slot is held until the job really finishes, even if we stop waiting
+        future.add_done_callback(lambda _: slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise ServiceBusyError()
+
+    def hash(self, password):
+        """Returns a werkzeug password hash using the configured method."""
+        return self._run(_hash_password, password, self.method)
+
+    def check(self, password_hash, password):
+        """Checks a password against a werkzeug password hash."""
+        return self._run(_check_password, password_hash, password)
+
+    def hash_many(self, passwords, workers=None):
+        """
+        Hashes a batch of passwords with the configured method on a dedicated
+        process pool, for bulk imports. Not subject to the request admission limit.
+        """
+        if not passwords:
+            return []
+
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(
+                pool.map(
+                    _hash_password,
+                    passwords,
+                    repeat(self.method),
+                    chunksize=max(1, len(passwords) // (4 * workers)),
+                )
+            )
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,28 @@
+import hashlib
+
+from flask import current_app, make_response, request
+
+
+def make_etag(*parts):
+    """Builds an ETag value from cheap summary values (counts, timestamps, role...)."""
+    raw = "|".join(str(part) for part in parts)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def is_not_modified(etag):
+    """True if the request's If-None-Match already holds etag (weak comparison)."""
+    return request.if_none_match.contains_weak(etag)
+
+
+def add_cache_headers(response, etag):
+    """Sets a weak ETag and the configured Cache-Control on a response."""
+    response.set_etag(etag, weak=True)
+    response.headers["Cache-Control"] = current_app.config["HTTP_CACHE_CONTROL"]
+    response.vary.add("Cookie")
+    return response
+
+
+def not_modified_response(etag):
+    """Empty 304 response for a matching If-None-Match."""
+    response = make_response("", 304)
+    return add_cache_headers(response, etag)
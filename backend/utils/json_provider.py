@@ -0,0 +1,80 @@
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date
+
+from flask.json.provider import JSONProvider
+from werkzeug.http import http_date
+
+try:
+    import orjson
+except ImportError:  # optional speedup; the app falls back to Flask's provider
+    orjson = None
+
+
+def _default(o):
+    """Same conversions as Flask's default provider (dates as HTTP dates)."""
+    if isinstance(o, date):
+        return http_date(o)
+
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+
+    if dataclasses.is_dataclass(o):
+        return dataclasses.asdict(o)
+
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def dumps_value(value):
+    """Encodes a single value to compact JSON bytes, formatted like jsonify."""
+    if orjson is not None:
+        return orjson.dumps(
+            value, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME
+        )
+    return json.dumps(value, default=_default, separators=(",", ":")).encode()
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    JSON provider backed by orjson. Output matches Flask's default provider:
+    sorted keys, HTTP dates, UUIDs as strings, compact unless in debug mode.
+    Non-ASCII characters are written as UTF-8 instead of \\u escapes.
+    """
+
+    sort_keys = True
+    compact = None
+    mimetype = "application/json"
+
+    def _option(self, sort_keys=True, indent=None):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        option = self._option(kwargs.get("sort_keys", self.sort_keys), kwargs.get("indent"))
+        return orjson.dumps(obj, default=kwargs.get("default", _default), option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(
+            obj, default=_default, option=self._option(self.sort_keys, indent=pretty)
+        )
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+
+def init_json_provider(app):
+    """Installs OrjsonProvider on the app when orjson is available."""
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
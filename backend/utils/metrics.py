@@ -0,0 +1,216 @@
+import bisect
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+
+from flask import request
+from sqlalchemy import event
+
+# upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestStats:
+    """Database work done while serving one request."""
+
+    def __init__(self, max_statements):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_seconds = 0.0
+        self.max_statements = max_statements
+        # min-heap of the slowest (seconds, seq, sql), at most max_statements;
+        # seq keeps equal durations from comparing the SQL text
+        self.statements = []
+        self._seq = itertools.count()
+
+    def record_query(self, statement, seconds):
+        self.query_count += 1
+        self.db_seconds += seconds
+        if self.max_statements <= 0:
+            return
+        item = (seconds, next(self._seq), statement)
+        if len(self.statements) < self.max_statements:
+            heapq.heappush(self.statements, item)
+        else:
+            heapq.heappushpop(self.statements, item)
+
+    def slowest(self):
+        """The kept statements as (seconds, sql), slowest first."""
+        return [(took, sql) for took, _, sql in sorted(self.statements, reverse=True)]
+
+
+# Stats of the request being served. Context variables follow the request
+# into async views and into SQLAlchemy's asyncio greenlets.
+current_request_stats = contextvars.ContextVar("current_request_stats", default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class RequestMetrics:
+    """Per-endpoint latency histograms and database counters for all requests."""
+
+    def __init__(self):
+        self.latency = {}  # (method, endpoint) -> Histogram
+        self.responses = {}  # (method, endpoint, status) -> count
+        self.db_queries = {}  # (method, endpoint) -> count
+        self.db_seconds = {}  # (method, endpoint) -> seconds
+        self._lock = threading.Lock()
+
+    def observe(self, method, endpoint, status, seconds, stats):
+        key = (method, endpoint)
+        with self._lock:
+            histogram = self.latency.get(key)
+            if histogram is None:
+                histogram = self.latency[key] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+
+            status_key = (method, endpoint, status)
+            self.responses[status_key] = self.responses.get(status_key, 0) + 1
+            self.db_queries[key] = self.db_queries.get(key, 0) + stats.query_count
+            self.db_seconds[key] = self.db_seconds.get(key, 0.0) + stats.db_seconds
+
+    def render(self):
+        """Returns the collected metrics in the Prometheus text format."""
+        lines = [
+            "# HELP http_request_duration_seconds Request latency by endpoint.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            for (method, endpoint), histogram in sorted(self.latency.items()):
+                labels = f'method="{method}",endpoint="{endpoint}"'
+                cumulative = 0
+                for bound, count in zip(self.buckets_with_inf(), histogram.counts):
+                    cumulative += count
+                    lines.append(
+                        f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}'
+                    )
+                lines.append(f"http_request_duration_seconds_sum{{{labels}}} {histogram.total}")
+                lines.append(f"http_request_duration_seconds_count{{{labels}}} {histogram.count}")
+
+            lines += [
+                "# HELP http_responses_total Responses by endpoint and status code.",
+                "# TYPE http_responses_total counter",
+            ]
+            for (method, endpoint, status), count in sorted(self.responses.items()):
+                lines.append(
+                    f'http_responses_total{{method="{method}",endpoint="{endpoint}",status="{status}"}} {count}'
+                )
+
+            lines += [
+                "# HELP db_queries_total SQL statements executed, by endpoint.",
+                "# TYPE db_queries_total counter",
+            ]
+            for (method, endpoint), count in sorted(self.db_queries.items()):
+                lines.append(f'db_queries_total{{method="{method}",endpoint="{endpoint}"}} {count}')
+
+            lines += [
+                "# HELP db_query_seconds_total Time spent in SQL statements, by endpoint.",
+                "# TYPE db_query_seconds_total counter",
+            ]
+            for (method, endpoint), seconds in sorted(self.db_seconds.items()):
+                lines.append(
+                    f'db_query_seconds_total{{method="{method}",endpoint="{endpoint}"}} {seconds}'
+                )
+        return lines
+
+    @staticmethod
+    def buckets_with_inf():
+        return [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+
+
+request_metrics = RequestMetrics()
+
+
+def track_queries(engine):
+    """
+    Times every statement run by `engine` (a sync Engine, or the sync_engine
+    of an AsyncEngine) and adds it to the current request's stats.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_query(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _end_query(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info["query_started"].pop()
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.record_query(statement, seconds)
+
+    @event.listens_for(engine, "handle_error")
+    def _failed_query(exception_context):
+        # after_cursor_execute does not run for failed statements
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started"):
+            connection.info["query_started"].pop()
+
+
+def format_gauges(name, help_text, values):
+    """Renders a dict of numbers as Prometheus gauges named <name>_<key>."""
+    lines = []
+    for key, value in values.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        lines.append(f"# HELP {name}_{key} {help_text}")
+        lines.append(f"# TYPE {name}_{key} gauge")
+        lines.append(f"{name}_{key} {value}")
+    return lines
+
+
+def init_request_metrics(app):
+    """
+    Times every request and counts its SQL statements. Requests slower than
+    SLOW_REQUEST_MS are logged with their slowest statements.
+    """
+    slow_seconds = app.config["SLOW_REQUEST_MS"] / 1000
+    max_statements = app.config["SLOW_REQUEST_MAX_STATEMENTS"]
+
+    @app.before_request
+    def _start_request_stats():
+        current_request_stats.set(RequestStats(max_statements))
+
+    @app.after_request
+    def _record_request_stats(response):
+        stats = current_request_stats.get()
+        if stats is None:
+            return response
+
+        seconds = time.perf_counter() - stats.started
+        # endpoint names rather than paths keep the label set small
+        endpoint = request.endpoint or "unmatched"
+        request_metrics.observe(
+            request.method, endpoint, response.status_code, seconds, stats
+        )
+
+        if 0 < slow_seconds < seconds:
+            slowest = stats.slowest()
+            app.logger.warning(
+                "Slow request: %s %s took %.3fs (%d queries, %.3fs in the database)%s",
+                request.method,
+                request.path,
+                seconds,
+                stats.query_count,
+                stats.db_seconds,
+                "".join(f"\n  [{took:.3f}s] {sql}" for took, sql in slowest),
+            )
+        return response
+
+    @app.teardown_request
+    def _clear_request_stats(exception):
+        current_request_stats.set(None)
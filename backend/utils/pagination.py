@@ -0,0 +1,50 @@
+import base64
+import uuid
+from datetime import datetime
+
+from flask import current_app
+
+from errors.api_errors import InvalidQueryParamError
+
+
+def get_page_size(args):
+    """Reads the `limit` query parameter and caps it at MAX_PAGE_SIZE."""
+    raw_limit = args.get("limit")
+    if raw_limit is None:
+        return current_app.config["DEFAULT_PAGE_SIZE"]
+
+    try:
+        limit = int(raw_limit)
+    except ValueError:
+        raise InvalidQueryParamError("limit")
+
+    if limit < 1:
+        raise InvalidQueryParamError("limit")
+
+    return min(limit, current_app.config["MAX_PAGE_SIZE"])
+
+
+def encode_cursor(sort_key, row_id):
+    """Encodes a (sort_key, id) keyset position as an opaque string."""
+    if isinstance(sort_key, datetime):
+        sort_key = sort_key.isoformat()
+    raw = f"{sort_key}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, parse_key=datetime.fromisoformat):
+    """Decodes a cursor produced by encode_cursor into (sort_key, id)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_key, row_id = base64.urlsafe_b64decode(padded).decode().rsplit("|", 1)
+        return parse_key(sort_key), uuid.UUID(row_id)
+    except ValueError:
+        raise InvalidQueryParamError("cursor")
+
+
+def get_cursor(args, parse_key=datetime.fromisoformat):
+    """Returns the decoded `cursor` query parameter, or None for the first page."""
+    cursor = args.get("cursor")
+    if not cursor:
+        return None
+    return decode_cursor(cursor, parse_key)
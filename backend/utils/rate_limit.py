@@ -0,0 +1,57 @@
+import math
+import time
+
+from errors.api_errors import TooManyAttemptsError
+from utils.cache_backends import InMemoryBackend
+
+
+class RateLimiter:
+    """
+    Sliding-window request limiter keyed by a rule name and an identifier
+    (client IP, email...). Each key keeps one counter per fixed window; the
+    previous window's count is weighted by how much of it still overlaps the
+    sliding window. Counters live in a CacheBackend, so a shared backend makes
+    the limits apply across processes.
+    """
+
+    def __init__(self):
+        self.backend = InMemoryBackend()
+        self.window_seconds = 60
+        self.limits = {}
+        self.rejected = 0
+
+    def configure(self, backend, window_seconds, limits):
+        """Applies the backend, window length and {rule: max requests} from the app config."""
+        self.backend = backend
+        self.window_seconds = window_seconds
+        self.limits = limits
+
+    def hit(self, rule, identifier):
+        """
+        Counts one request for (rule, identifier) and raises TooManyAttemptsError
+        once the sliding-window count exceeds the rule's limit. Rules with a
+        limit of 0 (or missing identifiers) are not enforced.
+        """
+        limit = self.limits.get(rule, 0)
+        if limit <= 0 or not identifier:
+            return
+
+        now = time.time()
+        window = int(now // self.window_seconds)
+        elapsed = now / self.window_seconds - window
+        key = f"ratelimit:{rule}:{identifier}"
+
+        # counters outlive their window by one window, while they still matter
+        current = self.backend.incr(f"{key}:{window}", ttl=2 * self.window_seconds)
+        previous = self.backend.get(f"{key}:{window - 1}") or 0
+
+        if previous * (1 - elapsed) + current > limit:
+            self.rejected += 1
+            retry_after = math.ceil((1 - elapsed) * self.window_seconds)
+            raise TooManyAttemptsError(retry_after=max(retry_after, 1))
+
+    def stats(self):
+        return {"rejected": self.rejected}
+
+
+rate_limiter = RateLimiter()
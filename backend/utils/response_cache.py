@@ -0,0 +1,101 @@
+import asyncio
+import threading
+
+from utils.cache_backends import InMemoryBackend
+
+
+class ReviewFeedCache:
+    """
+    Cache of serialized review pages keyed by role, path and query string.
+    The payload only depends on those, so every caller with that role
+    shares the entry. Writes bump a generation number that is part of every
+    key, which invalidates all pages at once without deleting them.
+    """
+
+    GENERATION_KEY = "reviews:generation"
+
+    def __init__(self):
+        self.backend = InMemoryBackend()
+        self.ttl_seconds = 30
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+        self.rebuild_seconds_total = 0.0
+        self.rebuild_seconds_max = 0.0
+        self._lock = threading.Lock()
+
+    def configure(self, backend, ttl_seconds):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+
+    def generation(self):
+        """Number of review writes seen by the backend; changes on every invalidate()."""
+        return self.backend.get(self.GENERATION_KEY) or 0
+
+    def key(self, role, path, query_string):
+        generation = self.generation()
+        if isinstance(query_string, bytes):
+            query_string = query_string.decode()
+        # the path carries the route's own filters (e.g. the recipient id)
+        return f"reviews:{generation}:{role}:{path}?{query_string}"
+
+    def get(self, key):
+        """Returns the cached (etag, body) for key, or None."""
+        if self.ttl_seconds <= 0:
+            return None
+
+        cached = self.backend.get(key)
+        with self._lock:
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return cached
+
+    def set(self, key, etag, body, rebuild_seconds):
+        """Stores a freshly built page and records how long it took to build."""
+        with self._lock:
+            self.rebuilds += 1
+            self.rebuild_seconds_total += rebuild_seconds
+            self.rebuild_seconds_max = max(self.rebuild_seconds_max, rebuild_seconds)
+
+        if self.ttl_seconds > 0:
+            self.backend.set(key, (etag, body), self.ttl_seconds)
+
+    def invalidate(self):
+        """Drops every cached page; called after a review is written."""
+        self.backend.incr(self.GENERATION_KEY)
+
+    # async views call these so a network backend does not block the event loop
+
+    async def _call(self, method, *args):
+        if self.backend.blocking:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    async def generation_async(self):
+        return await self._call(self.generation)
+
+    async def key_async(self, role, path, query_string):
+        return await self._call(self.key, role, path, query_string)
+
+    async def get_async(self, key):
+        return await self._call(self.get, key)
+
+    async def set_async(self, key, etag, body, rebuild_seconds):
+        return await self._call(self.set, key, etag, body, rebuild_seconds)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "rebuilds": self.rebuilds,
+                "rebuild_seconds_total": self.rebuild_seconds_total,
+                "rebuild_seconds_max": self.rebuild_seconds_max,
+            }
+
+
+review_feed_cache = ReviewFeedCache()
@@ -0,0 +1,143 @@
+import time
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+
+from access.access import visible_fields
+from models.models import ReviewStats, Session
+
+COUNTERS = [
+    "reviews_received",
+    "positive_received",
+    "negative_received",
+    "reviews_authored",
+    "positive_authored",
+    "negative_authored",
+]
+TIMESTAMPS = ["last_received_at", "last_authored_at"]
+
+# recomputes every counter from the reviews table
+REBUILD_SQL = """
+INSERT INTO review_stats (
+    user_id,
+    reviews_received, positive_received, negative_received,
+    reviews_authored, positive_authored, negative_authored,
+    last_received_at, last_authored_at
+)
+SELECT
+    user_id,
+    count(*) FILTER (WHERE received),
+    count(*) FILTER (WHERE received AND has_positive),
+    count(*) FILTER (WHERE received AND has_negative),
+    count(*) FILTER (WHERE NOT received),
+    count(*) FILTER (WHERE NOT received AND has_positive),
+    count(*) FILTER (WHERE NOT received AND has_negative),
+    max(created_at) FILTER (WHERE received),
+    max(created_at) FILTER (WHERE NOT received)
+FROM (
+    SELECT recipient_id AS user_id, true AS received, created_at,
+           coalesce(positive, '') <> '' AS has_positive,
+           coalesce(negative, '') <> '' AS has_negative
+    FROM reviews
+    UNION ALL
+    SELECT author_id, false, created_at,
+           coalesce(positive, '') <> '',
+           coalesce(negative, '') <> ''
+    FROM reviews
+) AS review_sides
+GROUP BY user_id
+"""
+
+
+def record_reviews(session, reviews):
+    """
+    Adds newly inserted reviews to review_stats within the caller's transaction.
+    `reviews` are rows or mappings with recipient_id, author_id, positive,
+    negative and created_at. One INSERT ... ON CONFLICT DO UPDATE covers every
+    affected user, in user id order so concurrent writers lock rows alike.
+    """
+    deltas = {}
+
+    def add(user_id, side, review):
+        row = deltas.setdefault(
+            user_id, dict({name: 0 for name in COUNTERS}, user_id=user_id)
+        )
+        row[f"reviews_{side}"] += 1
+        row[f"positive_{side}"] += bool(review["positive"])
+        row[f"negative_{side}"] += bool(review["negative"])
+        last = f"last_{side}_at"
+        row[last] = max(filter(None, [row.get(last), review["created_at"]]), default=None)
+
+    for review in reviews:
+        review = review._mapping if hasattr(review, "_mapping") else review
+        add(review["recipient_id"], "received", review)
+        add(review["author_id"], "authored", review)
+
+    if not deltas:
+        return
+
+    rows = [
+        dict({name: None for name in TIMESTAMPS}, **deltas[user_id])
+        for user_id in sorted(deltas, key=str)
+    ]
+    statement = insert(ReviewStats).values(rows)
+    excluded = statement.excluded
+    session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[ReviewStats.user_id],
+            set_={
+                **{
+                    name: getattr(ReviewStats, name) + getattr(excluded, name)
+                    for name in COUNTERS
+                },
+                # greatest() skips NULLs
+                **{
+                    name: func.greatest(getattr(ReviewStats, name), getattr(excluded, name))
+                    for name in TIMESTAMPS
+                },
+            },
+        )
+    )
+
+
+def rebuild_review_stats():
+    """
+    Recomputes review_stats from the reviews table in one transaction.
+    Review writes wait for it (SHARE lock on reviews), reads do not.
+    Returns the number of users with stats and the seconds taken.
+    """
+    start = time.perf_counter()
+    with Session.begin() as session:
+        session.execute(text("LOCK TABLE reviews IN SHARE MODE"))
+        session.execute(text("DELETE FROM review_stats"))
+        users = session.execute(text(REBUILD_SQL)).rowcount
+
+    return {"users": users, "seconds": round(time.perf_counter() - start, 3)}
+
+
+def stats_columns():
+    """ReviewStats columns to select alongside a LEFT JOIN to review_stats."""
+    return [getattr(ReviewStats, name) for name in COUNTERS + TIMESTAMPS]
+
+
+def serialize_stats(stats, role, own=False):
+    """
+    Returns the stats visible to `role`: negative counts only for roles that
+    see negative text, authored counts only for roles that see authors or for
+    the caller's own stats. A missing stats row reads as zeros.
+    """
+    allowed = visible_fields(role)
+    values = {
+        name: (getattr(stats, name, None) if stats is not None else None)
+        for name in COUNTERS + TIMESTAMPS
+    }
+
+    result = {}
+    for name, value in values.items():
+        if name.startswith("negative_") and "negative" not in allowed:
+            continue
+        if name.endswith("authored") or name == "last_authored_at":
+            if not own and "author_id" not in allowed:
+                continue
+        result[name] = value if value is not None or name in TIMESTAMPS else 0
+    return result
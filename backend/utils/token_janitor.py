@@ -0,0 +1,66 @@
+import threading
+import time
+
+from sqlalchemy import delete, func, or_, select
+
+from models.models import RefreshToken, Session
+
+
+def purge_refresh_tokens(batch_size, max_batches=None):
+    """
+    Deletes expired or revoked refresh tokens, at most batch_size rows per
+    transaction, until none are left (or max_batches is reached).
+    Returns the number of rows removed, batches run and seconds taken.
+    """
+    start = time.perf_counter()
+    deleted = 0
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        # SKIP LOCKED lets several janitors (one per worker) run side by side
+        stale_ids = (
+            select(RefreshToken.id)
+            .where(or_(RefreshToken.is_revoked, RefreshToken.expires_at < func.now()))
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+
+        with Session.begin() as session:
+            result = session.execute(
+                delete(RefreshToken)
+                .where(RefreshToken.id.in_(stale_ids))
+                .execution_options(synchronize_session=False)
+            )
+
+        batches += 1
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            break
+
+    return {
+        "deleted": deleted,
+        "batches": batches,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def start_token_janitor(app):
+    """Runs purge_refresh_tokens every TOKEN_JANITOR_INTERVAL_SECONDS in a daemon thread."""
+    interval = app.config["TOKEN_JANITOR_INTERVAL_SECONDS"]
+    batch_size = app.config["TOKEN_PURGE_BATCH_SIZE"]
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                report = purge_refresh_tokens(batch_size)
+                app.logger.info(
+                    f"Refresh token purge: removed {report['deleted']} rows "
+                    f"in {report['batches']} batches, {report['seconds']}s"
+                )
+            except Exception as e:
+                app.logger.error(f"Refresh token purge failed: {str(e)}")
+
+    thread = threading.Thread(target=run, name="token-janitor", daemon=True)
+    thread.start()
+    return thread
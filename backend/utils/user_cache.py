@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect
+
+from models.models import User
+
+
+class UserCache:
+    """
+    Bounded LRU cache of user ids known to exist, with a TTL per entry.
+    Lets verify_token skip the database for users it has seen recently.
+    """
+
+    def __init__(self, max_size=10000, ttl_seconds=60):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, max_size, ttl_seconds):
+        """Applies sizing from the app config and drops existing entries."""
+        with self._lock:
+            self.max_size = max_size
+            self.ttl_seconds = ttl_seconds
+            self._entries.clear()
+
+    def contains(self, user_id):
+        """Returns True if user_id is cached and not expired, counting hits/misses."""
+        key = str(user_id)
+        now = time.monotonic()
+
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is None or expires_at <= now:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return False
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True
+
+    def add(self, user_id):
+        """Marks user_id as existing, evicting the least recently used entry if full."""
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[str(user_id)] = time.monotonic() + self.ttl_seconds
+            self._entries.move_to_end(str(user_id))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+user_cache = UserCache()
+
+
+# Invalidate on ORM deletes and role changes. Changes made outside the ORM
+# (raw SQL, bulk updates) are picked up once the entry's TTL runs out.
+@event.listens_for(User, "after_delete")
+def _invalidate_deleted_user(mapper, connection, target):
+    user_cache.invalidate(target.id)
+
+
+@event.listens_for(User, "after_update")
+def _invalidate_user_role_change(mapper, connection, target):
+    if inspect(target).attrs.role.history.has_changes():
+        user_cache.invalidate(target.id)
@@ -1,4 +1,6 @@
 import { fetchWithAuth } from '@/lib/fetchUtils';
+import type { Page } from '@/types/page';
+import type { ColleagueType } from '@/types/colleague';
 
 // get informaton abot current user
 export const fetchUser = async () => {
@@ -20,16 +22,25 @@ export const fetchUser = async () => {
 };
 
 
-// get list of all users
-export const fetchAllColleagues = async () => {
-  const res = await fetchWithAuth("/api/users");
+// search colleagues by name or email prefix, one page at a time
+export const searchColleagues = async (
+  query: string,
+  cursor: string | null = null,
+  limit = 20
+): Promise<Page<ColleagueType>> => {
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (query.trim()) params.set("q", query.trim());
+  if (cursor) params.set("cursor", cursor);
+
+  const res = await fetchWithAuth(`/api/users?${params}`);
 
   if (!res.ok) {
     const errorData = await res.json().catch(() => ({}));
-    throw new Error(errorData.message || 'Failed to fetch colleagues');
+    throw new Error(errorData.error?.message || 'Failed to fetch colleagues');
   }
 
-  return res.json();
+  const data = await res.json();
+  return { items: data.items ?? [], next_cursor: data.next_cursor ?? null };
 };
 
 // log in to the system
@@ -1,8 +1,13 @@
 import { fetchWithAuth } from "@/lib/fetchUtils";
+import type { Page } from "@/types/page";
+import type { ReviewType } from "@/types/review";
 
-// get all reviews
-export const fetchAllReviews = async () => {
-  const res = await fetchWithAuth("/api/reviews");
+// get one page of the review feed; pass the previous page's next_cursor for the next one
+export const fetchReviewsPage = async (cursor: string | null = null): Promise<Page<ReviewType>> => {
+  const url = cursor
+    ? `/api/reviews?cursor=${encodeURIComponent(cursor)}`
+    : "/api/reviews";
+  const res = await fetchWithAuth(url);
 
   if (!res.ok) {
     const data = await res.json().catch(() => ({}));
@@ -10,11 +15,11 @@ export const fetchAllReviews = async () => {
   }
 
   const data = await res.json();
-  if (!Array.isArray(data)) {
+  if (!Array.isArray(data?.items)) {
     throw new Error("Unexpected data format");
   }
 
-  return data;
+  return { items: data.items, next_cursor: data.next_cursor ?? null };
 };
 
 // create review
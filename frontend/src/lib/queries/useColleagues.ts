@@ -1,31 +1,23 @@
-import { useQuery } from "@tanstack/react-query";
-import { fetchAllColleagues } from "../api/auth";
-import { useColleagueStore } from "../../stores/colleagueStore";
-import { useEffect } from "react";
+import { useQuery, keepPreviousData } from "@tanstack/react-query";
+import { searchColleagues } from "../api/auth";
+import type { Page } from "../../types/page";
 import type { ColleagueType } from "../../types/colleague";
 
-export const useColleagues = () => {
-  const setColleagues = useColleagueStore((s) => s.setColleagues);
-
+// first page of colleagues matching `query` (name or email prefix)
+export const useColleagues = (query: string) => {
   const {
     data,
     error,
     isLoading,
     isError,
-    status,
-  } = useQuery<ColleagueType[]>({
-    queryKey: ["colleagues"],
-    queryFn: fetchAllColleagues,
+  } = useQuery<Page<ColleagueType>>({
+    queryKey: ["colleagues", query.trim().toLowerCase()],
+    queryFn: () => searchColleagues(query),
     staleTime: 5 * 60 * 1000,
     retry: 1,
     refetchOnWindowFocus: false,
+    placeholderData: keepPreviousData,
   });
 
-  useEffect(() => {
-    if (status === "success" && data) {
-      setColleagues(data);
-    }
-  }, [data, status, setColleagues]);
-
-  return { data, error, isLoading, isError };
+  return { data: data?.items ?? [], error, isLoading, isError };
 };
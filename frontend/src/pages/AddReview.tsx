@@ -1,14 +1,16 @@
 import type { FC, ChangeEvent, FormEvent } from "react";
 import { useEffect, useState } from "react";
 import { useUserStore } from "../stores/userStore";
-import { useColleagueStore } from "../stores/colleagueStore";
+import { useColleagues } from "@/lib/queries/useColleagues";
 import { createReview } from "@/lib/api/reviews";
+import type { ColleagueType } from "@/types/colleague";
 
 import { Link } from "react-router-dom"
 
 import Header from "@/components/Header";
 import Footer from "@/components/Footer";
 import { Button } from "@/components/ui/button";
+import { Input } from "@/components/ui/input"
 import { Textarea } from "@/components/ui/textarea"
 import { toast } from "sonner"
 import {
@@ -32,10 +34,26 @@ const initialFormData = {
     recipient_id: null
 };
 
+// wait for typing to pause before searching the directory
+const SEARCH_DEBOUNCE_MS = 300;
+
 const AddReview: FC = () => {
 
-    const colleagues = useColleagueStore((s) => s.colleagues);
+    const [search, setSearch] = useState("");
+    const [debouncedSearch, setDebouncedSearch] = useState("");
+    const [selectedColleague, setSelectedColleague] = useState<ColleagueType | null>(null);
+    const { data: matches } = useColleagues(debouncedSearch);
     const user = useUserStore((s) => s.user);
+
+    useEffect(() => {
+        const timer = setTimeout(() => setDebouncedSearch(search), SEARCH_DEBOUNCE_MS);
+        return () => clearTimeout(timer);
+    }, [search]);
+
+    // keep the chosen colleague selectable while the search changes
+    const colleagues = selectedColleague && !matches.some((c) => c.id === selectedColleague.id)
+        ? [selectedColleague, ...matches]
+        : matches;
     const isColleague = user?.role === 'colleague';
 
 
@@ -57,6 +75,7 @@ const AddReview: FC = () => {
     };
 
     const handleColleagueChange = (value: string) => {
+        setSelectedColleague(colleagues.find((c) => c.id.toString() === value) ?? null);
         setFormData((prev) => ({
             ...prev,
             recipient_id: value,
@@ -112,6 +131,7 @@ const AddReview: FC = () => {
             setFormData({
                 ...initialFormData
             });
+            setSelectedColleague(null);
 
         } catch (error: any) {
             toast.error(`Creation failed: ${error.message}`);
@@ -127,8 +147,14 @@ const AddReview: FC = () => {
                         <div className="w-full">
                             <p className="text-lg sm:text-xl font-semibold">Step 1</p>
                             <p className="text-base sm:text-xl">Choose colleague</p>
+                            <Input
+                                value={search}
+                                onChange={(e) => setSearch(e.target.value)}
+                                placeholder="Search by name or email"
+                                className="mt-6 sm:mt-8"
+                            />
                             <Select value={formData.recipient_id?.toString() ?? ""} onValueChange={handleColleagueChange}>
-                                <SelectTrigger className="w-full mt-6 sm:mt-8">
+                                <SelectTrigger className="w-full mt-3">
                                     <SelectValue placeholder="Select an option" />
                                 </SelectTrigger>
                                 <SelectContent>
@@ -1,13 +1,13 @@
 import type { FC } from "react";
-import { useEffect, useState } from "react";
+import { useCallback, useEffect, useState } from "react";
 import type { ReviewType } from "@/types/review"
-import { fetchAllReviews } from "@/lib/api/reviews";
+import { fetchReviewsPage } from "@/lib/api/reviews";
 import { useUser } from "@/lib/queries/useUser";
-import { useColleagues } from "@/lib/queries/useColleagues";
 
 import { Link } from "react-router-dom";
 
 import { Button } from "@/components/ui/button";
+import { toast } from "sonner";
 import Header from "@/components/Header";
 import Footer from "@/components/Footer";
 import {
@@ -22,38 +22,60 @@ import {
 
 const Reviews: FC = () => {
 
-    //load information about users and collegues
+    //load information about the current user
     useUser();
-    useColleagues();
 
     const [isLoading, setIsLoading] = useState(true);
+    const [isLoadingMore, setIsLoadingMore] = useState(false);
     const [error, setError] = useState<string | null>(null);
     const [reviews, setReviews] = useState<ReviewType[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
 
-    useEffect(() => {
-        let mounted = true;
+    // load the first page; further pages are fetched on demand
+    const loadFirstPage = useCallback((isMounted: () => boolean = () => true) => {
         setIsLoading(true);
         setError(null);
 
-        fetchAllReviews()
-            .then((data) => {
-                if (!mounted) return;
-                setReviews(data);
+        fetchReviewsPage()
+            .then((page) => {
+                if (!isMounted()) return;
+                setReviews(page.items);
+                setNextCursor(page.next_cursor);
             })
             .catch((e) => {
-                if (!mounted) return;
+                if (!isMounted()) return;
                 console.error(e);
                 setError("Can't load reviews");
             })
             .finally(() => {
-                if (!mounted) return;
+                if (!isMounted()) return;
                 setIsLoading(false);
             });
+    }, []);
 
+    useEffect(() => {
+        let mounted = true;
+        loadFirstPage(() => mounted);
         return () => {
             mounted = false;
         };
-    }, []);
+    }, [loadFirstPage]);
+
+    const loadMore = () => {
+        if (!nextCursor || isLoadingMore) return;
+        setIsLoadingMore(true);
+
+        fetchReviewsPage(nextCursor)
+            .then((page) => {
+                setReviews((prev) => [...prev, ...page.items]);
+                setNextCursor(page.next_cursor);
+            })
+            .catch((e) => {
+                console.error(e);
+                toast.error("Can't load more reviews");
+            })
+            .finally(() => setIsLoadingMore(false));
+    };
 
     const showNegativeCol = reviews.some(r => r?.negative != null && String(r.negative).trim() !== "");
     const showAuthorCol = reviews.some(r => r?.author_id != null && String(r.author_id).trim() !== "");
@@ -78,14 +100,7 @@ const Reviews: FC = () => {
                 {!isLoading && error && (
                     <div className="flex flex-col items-center justify-center w-full flex-1">
                         <p className="text-m font-semibold text-red-600">{error}</p>
-                        <Button className="mt-3" onClick={() => {
-                            setIsLoading(true);
-                            setError(null);
-                            fetchAllReviews()
-                                .then(setReviews)
-                                .catch(() => setError("Can't load reviews"))
-                                .finally(() => setIsLoading(false));
-                        }}>
+                        <Button className="mt-3" onClick={() => loadFirstPage()}>
                             Retry
                         </Button>
                     </div>
@@ -147,6 +162,15 @@ const Reviews: FC = () => {
                         </TableBody>
                     </Table>
                 )}
+
+                {/* Next page */}
+                {!isLoading && !error && nextCursor && (
+                    <div className="flex justify-center w-full">
+                        <Button variant="outline" onClick={loadMore} disabled={isLoadingMore}>
+                            {isLoadingMore ? "Loading..." : "Load more"}
+                        </Button>
+                    </div>
+                )}
             </main>
             <Footer />
         </div>